@@ -2,6 +2,8 @@ import pdfplumber
 import json
 import re
 
+import layout
+
 PDF_FILE = "manual2.pdf"
 PAGE_NUMBER = 8
 OUTPUT_JSON = "air_section_parts.json"
@@ -55,97 +57,87 @@ def clean_text1(value):
 
 
 
+def header_index(table):
+    """Index of the 'Item | Description | ...' header row, or None."""
+    for i, row in enumerate(table):
+        if row and clean(row[0]).lower() == "item":
+            return i
+    return None
+
+
 def table_to_records(table):
+    """
+    Records from one half of the parts list: a table with the
+    Item | Description | Qty/Part | Part/Qty | Mtl layout (see page_tables).
+    """
     records = []
 
-    current_left_item = None
-    current_right_item = None
+    current_item = None
 
-    for row in table[2:]:  
+    start = header_index(table)
+    rows = table[start + 1:] if start is not None else table[2:]
+
+    for row in rows:
         row = [clean(c) for c in row]
         cols = len(row)
 
-        # ---------------- LEFT TABLE ----------------
-        if cols >= 5:
-
-            # keep previous item if empty
-            if row[0]:
-                current_left_item = clean_text(row[0])
-
-            if row[3].strip("()"):
+        if cols < 5:
+            continue
 
-                part_no = ""
-                qty = ""
+        # keep previous item if empty
+        if row[0]:
+            current_item = clean_text(row[0])
 
-                data1 = clean_text(row[2])
-                data2 = clean_text(row[3])
+        if row[3].strip("()"):
 
-                if len(data1) <= 3:
-                    qty = data1.strip("()")
-                else:
-                    part_no = data1
+            part_no = ""
+            qty = ""
 
-                if len(data2) <= 3:
-                    qty = data2.strip("()")
-                else:
-                    part_no = data2
+            data1 = clean_text(row[2])
+            data2 = clean_text(row[3])
 
-                records.append({
-                    "item": current_left_item,
-                    "description": clean_text(row[1]),
-                    "part_no": part_no,
-                    "qty": qty,
-                    "material": row[4].strip("[]")
-                })
+            if len(data1) <= 3:
+                qty = data1.strip("()")
+            else:
+                part_no = data1
 
-        # ---------------- RIGHT TABLE ----------------
-        if cols >= 10:
+            if len(data2) <= 3:
+                qty = data2.strip("()")
+            else:
+                part_no = data2
 
-            if row[5]:
-                current_right_item = clean_text(row[5])
+            records.append({
+                "item": current_item,
+                "description": clean_text(row[1]),
+                "part_no": part_no,
+                "qty": qty,
+                "material": row[4].strip("[]")
+            })
 
-            if row[8].strip("()"):
-
-                part_no = ""
-                qty = ""
+    return records
 
-                data3 = clean_text(row[7])
-                data4 = clean_text(row[8])
 
-                if len(data3) <= 3:
-                    qty = data3.strip("()")
-                else:
-                    part_no = data3
+def tables_records(tables):
+    return [record for table in tables for record in table_to_records(table)]
 
-                if len(data4) <= 3:
-                    qty = data4.strip("()")
-                else:
-                    part_no = data4
 
-                records.append({
-                    "item": current_right_item,
-                    "description": clean_text(row[6]),
-                    "part_no": part_no,
-                    "qty": qty,
-                    "material": row[9].strip("[]")
-                })
-
-    return records
+def page_tables(page):
+    """
+    Parts-list tables of a page, one per half when two lists sit side
+    by side (see layout.region_tables).
+    """
+    return layout.region_tables(page)
 
 
 def extract_from_pdf(pdf_file, page_number):
     with pdfplumber.open(pdf_file) as pdf:
         page = pdf.pages[page_number - 1]
-        tables = page.extract_tables()
+        tables = page_tables(page)
         if not tables:
             print("No tables found on this page.")
             return []
 
-    all_records = []
-    for table in tables:
-        all_records.extend(table_to_records(table))
-
-    return all_records
+    return tables_records(tables)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,239 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import instrument
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+OUTPUT_DIR = Path("output/batch")
+
+# Combined RSS of the runner and its workers. Default: 75% of RAM.
+MEMORY_BUDGET_MB = int(os.environ.get("EXTRACT_MEMORY_BUDGET_MB", "0"))
+DEFAULT_BUDGET_SHARE = 0.75
+
+# Seconds between live memory checks while manuals are running
+POLL_INTERVAL = 0.5
+
+# ru_maxrss is kilobytes on Linux, bytes on macOS
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+MB = 1024 * 1024
+
+# ---------------------------------------------------
+# Memory readings
+# ---------------------------------------------------
+
+def total_memory_mb():
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / MB
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def default_budget_mb():
+    if MEMORY_BUDGET_MB:
+        return MEMORY_BUDGET_MB
+    total = total_memory_mb()
+    return total * DEFAULT_BUDGET_SHARE if total else None
+
+
+def rss_mb(pid):
+    """Current RSS of a process from /proc (None where /proc is unavailable)."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MB
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def child_pids():
+    pids = []
+    try:
+        for task in Path("/proc/self/task").iterdir():
+            with contextlib.suppress(OSError):
+                pids.extend(int(p) for p in (task / "children").read_text().split())
+    except OSError:
+        pass
+    return pids
+
+
+def live_rss_mb():
+    """RSS of this process plus its workers, or None off Linux."""
+    own = rss_mb(os.getpid())
+    if own is None:
+        return None
+    return own + sum(rss_mb(pid) or 0.0 for pid in child_pids())
+
+# ---------------------------------------------------
+# One manual (runs in a worker process)
+# ---------------------------------------------------
+
+def process_manual(pdf_path, trace_memory=False):
+    """
+    Find, classify and parse the tables of every page. Each page is
+    closed as soon as it is done, so pdfplumber's layout objects and
+    pdfium's page handle never outlive the page.
+    """
+    import pdfplumber
+    import pypdfium2 as pdfium
+
+    import page_router
+    import table_count_111
+
+    instrument.enable(memory=trace_memory)
+
+    pages = {}
+    failures = []
+
+    with instrument.span("pdfplumber.open"):
+        pdf = pdfplumber.open(pdf_path)
+        pdfium_doc = pdfium.PdfDocument(str(pdf_path))
+
+    try:
+        for page_no in range(1, len(pdf.pages) + 1):
+            page = pdf.pages[page_no - 1]
+            pdfium_page = pdfium_doc[page_no - 1]
+
+            try:
+                tables = page_router.extract_tables(page, pdfium_page)
+
+                with instrument.span("tables.dataframes", tables=len(tables)):
+                    dfs = table_count_111.tables_to_dataframes(tables)
+
+                with contextlib.redirect_stdout(io.StringIO()):
+                    pages[page_no] = table_count_111.parse_all_tables(dfs)
+
+            except Exception as e:
+                failures.append({"page": page_no, "error": f"{type(e).__name__}: {e}"})
+
+            finally:
+                pdfium_page.close()
+                page.close()
+
+        with instrument.span("json.dumps"):
+            payload = json.dumps(pages, indent=2, default=str)
+
+    finally:
+        pdf.close()
+        pdfium_doc.close()
+
+    return {
+        "pdf": str(pdf_path),
+        "pages": len(pages) + len(failures),
+        "failures": failures,
+        "records": sum(instrument.count_records(r) for r in pages.values()),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT / MB,
+        "trace": instrument.report(),
+        "output": payload,
+    }
+
+# ---------------------------------------------------
+# Batch runner
+# ---------------------------------------------------
+
+class BudgetedRunner:
+    """
+    Runs manuals in worker processes (one fresh process per manual) and
+    lowers the number running at once when memory gets tight:
+
+    - live RSS of runner + workers above the budget: one fewer slot
+    - after each manual: no more slots than budget / worst peak RSS seen
+
+    Running manuals are never killed; the runner just stops starting
+    new ones until usage is back under the budget.
+    """
+
+    def __init__(self, workers=None, budget_mb=None, trace_memory=False, log=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.limit = self.workers
+        self.budget_mb = budget_mb if budget_mb is not None else default_budget_mb()
+        self.trace_memory = trace_memory
+        self.worst_peak_mb = 0.0
+        self.log = log or (lambda msg: print(msg, file=sys.stderr))
+
+    def shrink(self, limit, reason):
+        limit = max(1, limit)
+        if limit < self.limit:
+            self.log(f"{reason}: concurrency {self.limit} -> {limit}")
+            self.limit = limit
+
+    def over_budget(self):
+        """(over, live RSS in MB); never over without a budget or a reading."""
+        live = live_rss_mb() if self.budget_mb else None
+        return live is not None and live > self.budget_mb, live
+
+    def run(self, pdf_files):
+        queue = list(pdf_files)
+        running = {}
+        results = []
+
+        with ProcessPoolExecutor(max_workers=self.workers, max_tasks_per_child=1) as pool:
+            while queue or running:
+                over, live = self.over_budget()
+
+                if over and running:
+                    self.shrink(len(running) - 1, f"RSS {live:.0f} MB over budget {self.budget_mb:.0f} MB")
+
+                # Always keep one manual going, even if the runner alone is over
+                while queue and len(running) < self.limit and (not over or not running):
+                    pdf_file = queue.pop(0)
+                    running[pool.submit(process_manual, pdf_file, self.trace_memory)] = pdf_file
+
+                done, _ = wait(running, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    pdf_file = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {"pdf": pdf_file, "error": f"{type(e).__name__}: {e}"}
+                    else:
+                        self.worst_peak_mb = max(self.worst_peak_mb, result["peak_rss_mb"])
+                        if self.budget_mb:
+                            self.shrink(
+                                int(self.budget_mb // self.worst_peak_mb),
+                                f"{Path(pdf_file).name} peaked at {result['peak_rss_mb']:.0f} MB",
+                            )
+                    results.append(result)
+
+        return results
+
+# ---------------------------------------------------
+# RUN
+# ---------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract tables from many manuals under a memory budget.")
+    parser.add_argument("pdfs", nargs="+")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--memory-budget-mb", type=float,
+                        help="RSS budget for runner + workers (default: EXTRACT_MEMORY_BUDGET_MB or 75%% of RAM)")
+    parser.add_argument("--trace-memory", action="store_true", help="tracemalloc peak per stage (slower)")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    runner = BudgetedRunner(args.workers, args.memory_budget_mb, args.trace_memory)
+    results = runner.run(args.pdfs)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    for result in results:
+        if "error" in result:
+            print(f"{result['pdf']}: {result['error']}")
+            continue
+
+        out = args.output_dir / f"{Path(result['pdf']).stem}.json"
+        out.write_text(result.pop("output"), encoding="utf-8")
+
+        print(f"\n{result['pdf']}: {result['pages']} pages, {result['records']} records, "
+              f"{len(result['failures'])} failures, peak RSS {result['peak_rss_mb']:.0f} MB -> {out}")
+        print(instrument.format_report(result["trace"]))
@@ -0,0 +1,277 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pdfplumber
+import pypdfium2 as pdfium
+
+import instrument
+import page_router
+import table_count_111
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+PDF_FILES = [
+    "661PX.pdf",
+    "PX03P.pdf",
+    "PX05P.pdf",
+    "PX07P.pdf",
+    "PX20P.pdf",
+    "PX20X.pdf",
+    "pro_series.pdf",
+]
+
+STAGES = ("open", "tables", "classify", "parse", "serialize")
+
+OUTPUT_DIR = Path("output/benchmarks")
+
+# ru_maxrss is kilobytes on Linux, bytes on macOS
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+# ---------------------------------------------------
+# Measurement
+# ---------------------------------------------------
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT / (1024 * 1024)
+
+
+class StageTimer:
+    """
+    Accumulates wall time, CPU time and the peak RSS high-water mark
+    per stage. ru_maxrss never goes down, so "rss_growth_mb" is how
+    much the process peak rose while that stage was running.
+    """
+
+    def __init__(self):
+        self.stats = {
+            name: {"calls": 0, "errors": 0, "wall_s": 0.0, "cpu_s": 0.0,
+                   "peak_rss_mb": 0.0, "rss_growth_mb": 0.0}
+            for name in STAGES
+        }
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        stats = self.stats[name]
+        rss0 = peak_rss_mb()
+        wall0 = time.perf_counter()
+        cpu0 = time.process_time()
+
+        try:
+            yield
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            stats["wall_s"] += time.perf_counter() - wall0
+            stats["cpu_s"] += time.process_time() - cpu0
+            stats["calls"] += 1
+
+            rss1 = peak_rss_mb()
+            stats["peak_rss_mb"] = max(stats["peak_rss_mb"], rss1)
+            stats["rss_growth_mb"] += rss1 - rss0
+
+
+def add_rates(stats, pages, records):
+    for s in stats.values():
+        wall = s["wall_s"]
+        s["pages_per_s"] = pages / wall if wall else None
+        s["records_per_s"] = records / wall if wall else None
+    return stats
+
+# ---------------------------------------------------
+# One manual
+# ---------------------------------------------------
+
+def benchmark_pdf(pdf_path):
+    """
+    Run the table_count_111 pipeline over every page of one manual and
+    time each stage. Parser chatter is discarded and per-page failures
+    are recorded instead of aborting the run.
+    """
+    timer = StageTimer()
+    results = {}
+    failures = []
+    tables_seen = 0
+    tables_classified = 0
+
+    with timer.stage("open"):
+        pdf = pdfplumber.open(pdf_path)
+        pdfium_doc = pdfium.PdfDocument(str(pdf_path))
+        pages = len(pdf.pages)
+
+    try:
+        for page_no in range(1, pages + 1):
+            stage = "tables"
+            page = pdf.pages[page_no - 1]
+
+            try:
+                with timer.stage("tables"):
+                    pdfium_page = pdfium_doc[page_no - 1]
+                    try:
+                        tables = page_router.extract_tables(page, pdfium_page)
+                    finally:
+                        pdfium_page.close()
+                    dfs = table_count_111.tables_to_dataframes(tables)
+
+                stage = "classify"
+                with timer.stage("classify"):
+                    kinds = [table_count_111.classify_table(df) for df in dfs]
+
+                tables_seen += len(dfs)
+                tables_classified += sum(1 for k in kinds if k)
+
+                stage = "parse"
+                with timer.stage("parse"), contextlib.redirect_stdout(io.StringIO()):
+                    results[page_no] = table_count_111.parse_all_tables(dfs, kinds)
+
+            except Exception as e:
+                failures.append({
+                    "page": page_no,
+                    "stage": stage,
+                    "error": f"{type(e).__name__}: {e}",
+                })
+
+            finally:
+                page.close()
+
+        with timer.stage("serialize"):
+            payload = json.dumps(results, indent=2, default=str)
+
+    finally:
+        pdf.close()
+        pdfium_doc.close()
+
+    records = sum(instrument.count_records(r) for r in results.values())
+
+    return {
+        "pdf": str(pdf_path),
+        "pages": pages,
+        "pages_ok": len(results),
+        "tables_seen": tables_seen,
+        "tables_classified": tables_classified,
+        "records": records,
+        "output_bytes": len(payload),
+        "stages": add_rates(timer.stats, pages, records),
+        "failures": failures,
+    }
+
+
+def benchmark_pdf_isolated(pdf_path):
+    """benchmark_pdf in a fresh process so peak RSS belongs to this manual alone."""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(benchmark_pdf, pdf_path).result()
+
+# ---------------------------------------------------
+# Run report
+# ---------------------------------------------------
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def totals(manuals):
+    stages = {}
+    for name in STAGES:
+        rows = [m["stages"][name] for m in manuals]
+        stages[name] = {
+            "calls": sum(r["calls"] for r in rows),
+            "errors": sum(r["errors"] for r in rows),
+            "wall_s": sum(r["wall_s"] for r in rows),
+            "cpu_s": sum(r["cpu_s"] for r in rows),
+            "peak_rss_mb": max((r["peak_rss_mb"] for r in rows), default=0.0),
+            "rss_growth_mb": max((r["rss_growth_mb"] for r in rows), default=0.0),
+        }
+
+    pages = sum(m["pages"] for m in manuals)
+    records = sum(m["records"] for m in manuals)
+
+    return {
+        "pages": pages,
+        "pages_ok": sum(m["pages_ok"] for m in manuals),
+        "tables_seen": sum(m["tables_seen"] for m in manuals),
+        "tables_classified": sum(m["tables_classified"] for m in manuals),
+        "records": records,
+        "stages": add_rates(stages, pages, records),
+    }
+
+
+def run_benchmark(pdf_files=PDF_FILES, isolate=True):
+    started = datetime.now(timezone.utc)
+    run = benchmark_pdf_isolated if isolate else benchmark_pdf
+
+    manuals = []
+    for pdf_file in pdf_files:
+        print(f"benchmarking {pdf_file} ...", file=sys.stderr)
+        manuals.append(run(pdf_file))
+
+    return {
+        "started": started.isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pdfplumber": pdfplumber.__version__,
+        "isolated": isolate,
+        "manuals": manuals,
+        "total": totals(manuals),
+    }
+
+
+def print_summary(report):
+    print(f"{'stage':<10} {'wall s':>9} {'cpu s':>9} {'peak MB':>9} {'pages/s':>9} {'records/s':>10}")
+    for name, s in report["total"]["stages"].items():
+        print(
+            f"{name:<10} {s['wall_s']:>9.2f} {s['cpu_s']:>9.2f} {s['peak_rss_mb']:>9.1f} "
+            f"{s['pages_per_s'] or 0:>9.1f} {s['records_per_s'] or 0:>10.1f}"
+        )
+
+    failed = sum(len(m["failures"]) for m in report["manuals"])
+    print(f"\n{report['total']['pages_ok']}/{report['total']['pages']} pages, "
+          f"{report['total']['records']} records, {failed} page failures")
+
+# ---------------------------------------------------
+# RUN
+# ---------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time each extraction stage over the bundled manuals.")
+    parser.add_argument("pdfs", nargs="*", default=PDF_FILES)
+    parser.add_argument("--output", type=Path, help="JSON report path (default: output/benchmarks/<timestamp>.json), or the directory with --profile")
+    parser.add_argument("--no-isolate", action="store_true", help="run every manual in this process")
+    parser.add_argument("--profile", action="store_true",
+                        help="cProfile every page and table instead; writes output/profile/<timestamp>/")
+    args = parser.parse_args()
+
+    if args.profile:
+        import profiling
+
+        report, out_dir = profiling.profile_manuals(args.pdfs, args.output)
+        print(profiling.format_slowest(report))
+        print(f"\nsaved {out_dir}")
+        sys.exit(0)
+
+    report = run_benchmark(args.pdfs, isolate=not args.no_isolate)
+
+    output = args.output or OUTPUT_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print_summary(report)
+    print(f"\nsaved {output}")
@@ -0,0 +1,310 @@
+import json
+import re
+import sys
+from itertools import combinations
+from pathlib import Path
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+FAMILY = "PX01"
+COMMON_PARTS_FILE = Path("common_parts111.json")
+MANIFOLD_BOM_FILE = Path("final_bom.json")
+DIAPHRAGM_FILE = Path("test.json")
+BALL_OPTIONS_FILE = Path("ball_options.json")
+SEAT_OPTIONS_FILE = Path("seat_options.json")
+
+# Position of each option table inside the "-XXX" option group
+# (Seat / Check / Diaphragm, same order as the model description chart)
+OPTION_POSITIONS = {"seat": 0, "ball": 1, "diaphragm": 2}
+
+WILDCARD = "X"
+
+# ---------------------------------------------------
+# Record normalization
+# ---------------------------------------------------
+
+FIELD_ALIASES = {
+    "item": ("item", "Item"),
+    "description": ("description", "Description"),
+    "part_no": ("part_no", "Part_No", "part_number", "Part Number"),
+    "material": ("material", "Material"),
+    "qty": ("qty", "Qty", "quantity", "Quantity"),
+}
+
+
+def parse_qty(val):
+    if val is None:
+        return 0
+    val = re.sub(r"[^\d]", "", str(val))
+    return int(val) if val else 0
+
+
+def normalize_item(record, description=None, item=None):
+    """Map the different extractor key styles onto one BOM line."""
+    line = {}
+    for field, keys in FIELD_ALIASES.items():
+        line[field] = next((record[k] for k in keys if k in record), None)
+
+    if description and not line["description"]:
+        line["description"] = description
+    if item is not None and line["item"] is None:
+        line["item"] = item
+
+    line["qty"] = parse_qty(line["qty"])
+    if line["material"]:
+        line["material"] = re.sub(r"[\[\]]", "", str(line["material"])).strip()
+    return line
+
+
+def split_variant(variant):
+    """'PX01X-HDS' -> ('01', 'HDS')"""
+    m = re.match(r"^P[XDE](\d{2})[A-Z0-9]?-([A-Z0-9]{3})", variant.strip().upper())
+    if not m:
+        return None, None
+    return m.group(1), m.group(2)
+
+
+def option_group(code):
+    """'-HPS-0XX' -> ('HPS', '0XX'), '-DXX' -> (None, 'DXX')"""
+    parts = [p for p in str(code).strip().upper().split("-") if p]
+    if not parts:
+        return None, None
+    if len(parts) == 1:
+        return None, parts[0]
+    return parts[0], parts[-1]
+
+
+def wildcard_masks(code):
+    """Yield 'HDS', then 'XDS', 'HXS', ..., finally 'XXX' (most specific first)."""
+    positions = [i for i, c in enumerate(code) if c != WILDCARD]
+    for n in range(len(positions) + 1):
+        for masked in combinations(positions, n):
+            chars = list(code)
+            for i in masked:
+                chars[i] = WILDCARD
+            yield "".join(chars)
+
+# ---------------------------------------------------
+# Section loaders -> flat option rows
+# ---------------------------------------------------
+
+def manifold_rows(manifold):
+    """
+    Accept final_bom.json ({variant: [items]}) or the
+    mainfold_fluid_1 output ({"mainfold": [{Variants: {...}}]}).
+    """
+    if "mainfold" in manifold:
+        variants = {}
+        for entry in manifold["mainfold"]:
+            for variant, part in entry.get("Variants", {}).items():
+                variants.setdefault(variant, []).append(
+                    normalize_item(part, entry.get("Description"), entry.get("Item"))
+                )
+        return variants
+
+    return {
+        variant: [normalize_item(p) for p in items]
+        for variant, items in manifold.items()
+    }
+
+
+def diaphragm_rows(diaphragm):
+    """
+    Accept diaphrgm_4 / test.json ({"options": [{option_code, components}]})
+    or diaphrgm_3 ({"diaphragm_options": [{Model_Code, <group>: {...}}]}).
+    """
+    rows = []
+
+    for opt in diaphragm.get("options", []):
+        items = []
+        for name, part in opt.get("components", {}).items():
+            m = re.search(r"_(\d+)$", name)
+            label = re.sub(r"_\d+$", "", name).replace("_", " ").title()
+            items.append(normalize_item(part, label, int(m.group(1)) if m else None))
+        rows.append((opt["option_code"], items))
+
+    for opt in diaphragm.get("diaphragm_options", []):
+        items = [
+            normalize_item(part, name.replace("_", " "))
+            for name, part in opt.items()
+            if isinstance(part, dict) and part.get("Part_No")
+        ]
+        rows.append((opt["Model_Code"], items))
+
+    return rows
+
+
+def option_rows(options, label):
+    """Ball / seat option lists ({code, part_number, qty, material})."""
+    rows = []
+    for opt in options:
+        code = opt.get("code") or opt.get("option_code")
+        rows.append((code, [normalize_item(opt, label)]))
+    return rows
+
+# ---------------------------------------------------
+# Index building
+# ---------------------------------------------------
+
+def build_family_index(common_parts=None, manifold=None, diaphragm=None,
+                       ball_options=None, seat_options=None):
+    """
+    Precompute the lookups for one pump family so an explosion only
+    needs dict hits:
+
+    manifold  -> {fluid_group_pattern: [items]}
+    seat/ball/diaphragm -> {option_char: [(fluid_group, [items])]}
+    """
+    index = {
+        "common": [normalize_item(p) for p in common_parts or []],
+        "manifold": {},
+        "seat": {},
+        "ball": {},
+        "diaphragm": {},
+    }
+
+    for variant, items in manifold_rows(manifold or {}).items():
+        _, group = split_variant(variant)
+        if group:
+            index["manifold"].setdefault(group, []).extend(items)
+
+    tables = {
+        "seat": option_rows(seat_options or [], "Seat"),
+        "ball": option_rows(ball_options or [], "Ball"),
+        "diaphragm": diaphragm_rows(diaphragm or {}),
+    }
+
+    for table, rows in tables.items():
+        pos = OPTION_POSITIONS[table]
+        for code, items in rows:
+            fluid_group, group = option_group(code)
+            if not group or len(group) <= pos or not items:
+                continue
+            index[table].setdefault(group[pos], []).append((fluid_group, items))
+
+    return index
+
+
+def build_index_from_files(family=FAMILY, common_parts_file=COMMON_PARTS_FILE,
+                           manifold_file=MANIFOLD_BOM_FILE, diaphragm_file=DIAPHRAGM_FILE,
+                           ball_file=BALL_OPTIONS_FILE, seat_file=SEAT_OPTIONS_FILE):
+    def load(path):
+        if not path or not Path(path).exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    return {
+        family: build_family_index(
+            common_parts=load(common_parts_file),
+            manifold=load(manifold_file),
+            diaphragm=load(diaphragm_file),
+            ball_options=load(ball_file),
+            seat_options=load(seat_file),
+        )
+    }
+
+# ---------------------------------------------------
+# Explosion
+# ---------------------------------------------------
+
+def parse_model_code(model_code):
+    """'PD01P-HDS-DAA-A00' -> ('PX01', 'HDS', 'DAA')"""
+    groups = [g for g in str(model_code).strip().upper().split("-") if g]
+    if len(groups) < 3:
+        raise ValueError(f"Incomplete model code: {model_code}")
+
+    m = re.match(r"^P[XDE](\d{2})", groups[0])
+    if not m:
+        raise ValueError(f"Unknown model series: {model_code}")
+
+    return f"PX{m.group(1)}", groups[1], groups[2]
+
+
+def rollup(lines):
+    """Merge lines with the same part number, summing quantities."""
+    merged = {}
+    for line in lines:
+        key = line["part_no"]
+        if not key:
+            continue
+        if key in merged:
+            merged[key]["qty"] += line["qty"]
+            if line["source"] not in merged[key]["sources"]:
+                merged[key]["sources"].append(line["source"])
+        else:
+            merged[key] = {
+                "item": line["item"],
+                "description": line["description"],
+                "part_no": key,
+                "material": line["material"],
+                "qty": line["qty"],
+                "sources": [line["source"]],
+            }
+
+    return sorted(
+        merged.values(),
+        key=lambda r: (r["item"] is None, int(r["item"]) if str(r["item"]).isdigit() else 0)
+    )
+
+
+def select_sub_boms(model_code, indexes):
+    """
+    Return the BOM contributions selected by a model code, keyed by
+    source (common / manifold / seat / ball / diaphragm).
+    """
+    family, fluid_group, options = parse_model_code(model_code)
+
+    index = indexes.get(family)
+    if index is None:
+        raise KeyError(f"No BOM index for family {family}")
+
+    sub_boms = {"common": index["common"], "manifold": []}
+
+    # Most specific manifold variant wins (HDS before XDS before XXX)
+    for pattern in wildcard_masks(fluid_group):
+        items = index["manifold"].get(pattern)
+        if items:
+            sub_boms["manifold"] = items
+            break
+
+    for table, pos in OPTION_POSITIONS.items():
+        sub_boms[table] = []
+        if len(options) <= pos:
+            continue
+        for required_group, items in index[table].get(options[pos], []):
+            if required_group and required_group != fluid_group:
+                continue
+            sub_boms[table] = sub_boms[table] + items
+
+    return sub_boms
+
+
+def explode_sub_boms(sub_boms):
+    lines = []
+    for source, items in sub_boms.items():
+        lines.extend(dict(p, source=source) for p in items)
+    return rollup(lines)
+
+
+def explode_bom(model_code, indexes):
+    """
+    Compose common parts, the manifold variant and the seat / ball /
+    diaphragm option rows selected by the model code into one BOM.
+    """
+    return explode_sub_boms(select_sub_boms(model_code, indexes))
+
+# ---------------------------------------------------
+# RUN
+# ---------------------------------------------------
+
+if __name__ == "__main__":
+    model = sys.argv[1] if len(sys.argv) > 1 else "PX01X-HDS-DAA-A00"
+
+    indexes = build_index_from_files()
+    bom = explode_bom(model, indexes)
+
+    print(json.dumps(bom, indent=2))
+    print(f"✅ {model}: {len(bom)} BOM lines")
@@ -0,0 +1,313 @@
+import argparse
+import hashlib
+import json
+import random
+import sqlite3
+import string
+import sys
+import zlib
+from itertools import product
+from pathlib import Path
+
+import bom_engine
+import model_decoder
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+CHART_FILE = Path("model_description_chart.json")
+STORE_FILE = Path("output/bom_store.db")
+
+# Only these chart sections select parts in bom_engine, the other
+# fields (series, center body, revision, specialty codes) share the
+# same BOM and are collapsed when enumerating configurations
+FLUID_GROUP_SECTIONS = [
+    "Connection",
+    "Fluid Caps / Manifold Material",
+    "Hardware Material",
+]
+OPTION_GROUP_SECTIONS = [
+    "Seat / Spacer Material",
+    "Check Material",
+    "Diaphragm / O-Ring Material",
+]
+
+SUB_BOM_SOURCES = ["common", "manifold", "seat", "ball", "diaphragm"]
+
+# Model codes sampled by the lookup_bom / explode_bom round-trip check
+CHECK_SAMPLES = 200
+
+# ---------------------------------------------------
+# Configuration enumeration
+# ---------------------------------------------------
+
+def index_codes(index):
+    """
+    Codes the family index keys on, per fluid group position (manifold
+    variants and option rows tied to a fluid group) and per option
+    group position (seat / ball / diaphragm option characters).
+    """
+    fluid = [set() for _ in FLUID_GROUP_SECTIONS]
+    fluid_groups = list(index.get("manifold", {}))
+
+    for table in bom_engine.OPTION_POSITIONS:
+        for rows in index.get(table, {}).values():
+            fluid_groups.extend(group for group, _ in rows if group)
+
+    for group in fluid_groups:
+        for pos, code in enumerate(group[:len(fluid)]):
+            fluid[pos].add(code)
+
+    options = [set() for _ in OPTION_GROUP_SECTIONS]
+    for table, pos in bom_engine.OPTION_POSITIONS.items():
+        options[pos].update(index.get(table, {}))
+
+    return fluid, options
+
+
+def section_codes(chart, section, known=()):
+    """
+    The chart's codes for a section plus those the index keys on (the
+    chart can be incomplete, e.g. an empty Connection section), and
+    WILDCARD standing in for every other code.
+    """
+    codes = (set(chart.get(section, {})) | set(known)) - {bom_engine.WILDCARD}
+    return sorted(codes) + [bom_engine.WILDCARD]
+
+
+def configuration_codes(chart, index=None):
+    """Materialized codes per position: (fluid group codes, option group codes)."""
+    chart = model_decoder.load_chart(chart)
+    fluid_known, option_known = index_codes(index or {})
+
+    fluid = [section_codes(chart, s, k) for s, k in zip(FLUID_GROUP_SECTIONS, fluid_known)]
+    options = [section_codes(chart, s, k) for s, k in zip(OPTION_GROUP_SECTIONS, option_known)]
+    return fluid, options
+
+
+def enumerate_configurations(family, chart, index=None):
+    """Yield 'PX01-HDS-DAA' style keys for every valid code combination."""
+    fluid, options = configuration_codes(chart, index)
+
+    fluid_groups = ["".join(c) for c in product(*fluid)]
+    option_groups = ["".join(c) for c in product(*options)]
+
+    for fluid_group in fluid_groups:
+        for option_group in option_groups:
+            yield f"{family}-{fluid_group}-{option_group}"
+
+
+def collapse_unknown(group, codes):
+    """'ADS' -> 'XDS' when 'A' was not materialized at position 0."""
+    return "".join(
+        c if i >= len(codes) or c in codes[i] else bom_engine.WILDCARD
+        for i, c in enumerate(group)
+    )
+
+
+def config_key(model_code, codes=None):
+    """
+    Store key of a model code. With the family's materialized `codes`,
+    codes the chart and index do not know are collapsed to WILDCARD,
+    which selects the same parts in bom_engine.
+    """
+    family, fluid_group, option_group = bom_engine.parse_model_code(model_code)
+    if codes is not None:
+        fluid_group = collapse_unknown(fluid_group, codes[0])
+        option_group = collapse_unknown(option_group, codes[1])
+    return f"{family}-{fluid_group}-{option_group}"
+
+# ---------------------------------------------------
+# Store
+# ---------------------------------------------------
+
+def sub_bom_hash(lines):
+    payload = json.dumps(lines, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16], payload
+
+
+def create_store(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sub_boms (
+            hash TEXT PRIMARY KEY,
+            lines BLOB
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS configurations (
+            model_key TEXT PRIMARY KEY,
+            {", ".join(f"{s} TEXT" for s in SUB_BOM_SOURCES)}
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS family_codes (
+            family TEXT PRIMARY KEY,
+            codes TEXT
+        ) WITHOUT ROWID
+    """)
+
+
+def materialize(indexes, chart, store_path=STORE_FILE):
+    """
+    Resolve the sub-BOMs of every configuration of every family in
+    `indexes` and write them to a SQLite store. Identical sub-BOMs
+    (e.g. the common parts, or one seat option shared by all manifold
+    variants) are stored once and referenced by hash.
+    """
+    store_path = Path(store_path)
+    store_path.parent.mkdir(exist_ok=True)
+
+    stats = {"configurations": 0, "sub_boms": 0}
+    known_hashes = set()
+
+    conn = sqlite3.connect(store_path)
+    try:
+        create_store(conn)
+
+        for family, index in indexes.items():
+            config_rows = []
+            codes = configuration_codes(chart, index)
+            conn.execute(
+                "INSERT OR REPLACE INTO family_codes VALUES (?, ?)",
+                (family, json.dumps(codes)),
+            )
+
+            for model_key in enumerate_configurations(family, chart, index):
+                sub_boms = bom_engine.select_sub_boms(model_key, indexes)
+
+                refs = []
+                for source in SUB_BOM_SOURCES:
+                    digest, payload = sub_bom_hash(sub_boms.get(source, []))
+                    if digest not in known_hashes:
+                        known_hashes.add(digest)
+                        conn.execute(
+                            "INSERT OR IGNORE INTO sub_boms VALUES (?, ?)",
+                            (digest, zlib.compress(payload.encode("utf-8"))),
+                        )
+                    refs.append(digest)
+
+                config_rows.append((model_key, *refs))
+
+            conn.executemany(
+                f"INSERT OR REPLACE INTO configurations VALUES "
+                f"({', '.join('?' * (len(SUB_BOM_SOURCES) + 1))})",
+                config_rows,
+            )
+            stats["configurations"] += len(config_rows)
+
+        conn.commit()
+    finally:
+        conn.close()
+
+    stats["sub_boms"] = len(known_hashes)
+    return stats
+
+# ---------------------------------------------------
+# Lookup
+# ---------------------------------------------------
+
+def lookup_bom(model_code, store_path=STORE_FILE, conn=None):
+    """
+    Return the rolled-up BOM for a model code from the store, or None
+    if the configuration was not materialized.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(store_path)
+
+    try:
+        family = bom_engine.parse_model_code(model_code)[0]
+        codes = conn.execute(
+            "SELECT codes FROM family_codes WHERE family = ?", (family,)
+        ).fetchone()
+        if codes is None:
+            return None
+
+        row = conn.execute(
+            f"SELECT {', '.join(SUB_BOM_SOURCES)} FROM configurations WHERE model_key = ?",
+            (config_key(model_code, json.loads(codes[0])),),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        sub_boms = {}
+        for source, digest in zip(SUB_BOM_SOURCES, row):
+            blob = conn.execute(
+                "SELECT lines FROM sub_boms WHERE hash = ?", (digest,)
+            ).fetchone()[0]
+            sub_boms[source] = json.loads(zlib.decompress(blob))
+
+        return bom_engine.explode_sub_boms(sub_boms)
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def sample_model_codes(family, chart, index=None, n=CHECK_SAMPLES, seed=0):
+    """
+    Random full model codes of a family. Besides materialized codes,
+    every position sometimes gets a code nobody lists, so the
+    WILDCARD collapse in lookup_bom is exercised as well.
+    """
+    rng = random.Random(seed)
+    fluid, options = configuration_codes(chart, index)
+    alphabet = string.ascii_uppercase + string.digits
+
+    def pick(codes):
+        return "".join(
+            rng.choice(alphabet) if rng.random() < 0.2 else rng.choice(c)
+            for c in codes
+        )
+
+    return [f"{family}X-{pick(fluid)}-{pick(options)}-A00" for _ in range(n)]
+
+
+def round_trip_mismatches(indexes, chart, store_path=STORE_FILE, n=CHECK_SAMPLES):
+    """
+    Sampled model codes whose stored BOM differs from
+    bom_engine.explode_bom, as (model_code, stored, exploded).
+    """
+    mismatches = []
+    conn = sqlite3.connect(store_path)
+    try:
+        for family, index in indexes.items():
+            for code in sample_model_codes(family, chart, index, n):
+                stored = lookup_bom(code, conn=conn)
+                exploded = bom_engine.explode_bom(code, indexes)
+                if stored != exploded:
+                    mismatches.append((code, stored, exploded))
+    finally:
+        conn.close()
+    return mismatches
+
+# ---------------------------------------------------
+# RUN
+# ---------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Materialize every configuration BOM into a SQLite store.")
+    parser.add_argument("model_code", nargs="?", help="print the stored BOM of this model code")
+    parser.add_argument("--check", type=int, default=CHECK_SAMPLES,
+                        help="sampled codes checked against bom_engine.explode_bom (0 to skip)")
+    args = parser.parse_args()
+
+    indexes = bom_engine.build_index_from_files()
+    stats = materialize(indexes, CHART_FILE)
+
+    print(f"✅ Materialized {stats['configurations']} configurations "
+          f"using {stats['sub_boms']} distinct sub-BOMs")
+    print(f"📄 Saved to {STORE_FILE}")
+
+    if args.check:
+        mismatches = round_trip_mismatches(indexes, CHART_FILE, n=args.check)
+        for code, stored, exploded in mismatches[:10]:
+            print(f"❌ {code}: stored {len(stored or [])} lines, explode_bom {len(exploded)} lines")
+        print(f"Round trip: {len(mismatches)} of {args.check * len(indexes)} sampled codes differ")
+
+    if args.model_code:
+        print(json.dumps(lookup_bom(args.model_code), indent=2))
+
+    if args.check and mismatches:
+        sys.exit(1)
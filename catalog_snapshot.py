@@ -0,0 +1,209 @@
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+import chart_codes
+
+# bom_engine is imported by build_catalog_entries only, and chart
+# sections come from chart_codes rather than model_decoder (pandas),
+# so readers of a compiled snapshot stay light
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+CHART_FILE = Path("model_description_chart.json")
+PARTS_FILES = [
+    Path("common_parts111.json"),
+    Path("air_section_parts.json"),
+    Path("final_bom.json"),
+    Path("ball_options.json"),
+    Path("seat_options.json"),
+]
+SNAPSHOT_FILE = Path("output/catalog.snap")
+
+# ---------------------------------------------------
+# File layout
+#
+#   header   MAGIC | version u32 | count u32 | heap_offset u64
+#   index    count x (key_off u64, key_len u32, val_off u64, val_len u32)
+#            sorted by key bytes, fixed width so it can be bisected
+#   heap     UTF-8 keys and JSON values
+# ---------------------------------------------------
+
+MAGIC = b"PXCATLG1"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQ")
+ENTRY = struct.Struct("<QIQI")
+
+PART_PREFIX = "part:"
+CHART_PREFIX = "chart:"
+KEY_SEP = "\x1f"
+
+# ---------------------------------------------------
+# Catalog entries
+# ---------------------------------------------------
+
+def part_key(part_no):
+    return f"{PART_PREFIX}{str(part_no).strip()}"
+
+
+def chart_key(section, code):
+    return f"{CHART_PREFIX}{section}{KEY_SEP}{code}"
+
+
+def iter_part_records(data):
+    """Flatten the list / variant-dict shapes the extractors write."""
+    if isinstance(data, list):
+        yield from data
+    elif isinstance(data, dict):
+        for items in data.values():
+            if isinstance(items, list):
+                yield from items
+
+
+def build_catalog_entries(parts_files=PARTS_FILES, chart=CHART_FILE):
+    import bom_engine
+
+    entries = {}
+
+    for path in parts_files:
+        if not Path(path).exists():
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        for record in iter_part_records(data):
+            line = bom_engine.normalize_item(record)
+            if not line["part_no"]:
+                continue
+            # First manual that lists a part number wins
+            entries.setdefault(part_key(line["part_no"]), {
+                "description": line["description"],
+                "material": line["material"],
+            })
+
+    if chart and Path(chart).exists():
+        for section, codes in chart_codes.load_chart(chart).items():
+            for code, description in codes.items():
+                entries[chart_key(section, code)] = description
+
+    return entries
+
+# ---------------------------------------------------
+# Compile
+# ---------------------------------------------------
+
+def compile_snapshot(entries, path=SNAPSHOT_FILE):
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True)
+
+    items = sorted(
+        (k.encode("utf-8"), json.dumps(v, separators=(",", ":")).encode("utf-8"))
+        for k, v in entries.items()
+    )
+
+    heap_offset = HEADER.size + ENTRY.size * len(items)
+    index = bytearray()
+    heap = bytearray()
+
+    for key, value in items:
+        key_off = heap_offset + len(heap)
+        heap += key
+        val_off = heap_offset + len(heap)
+        heap += value
+        index += ENTRY.pack(key_off, len(key), val_off, len(value))
+
+    # Write to a temp file and rename so readers never map a partial file
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(items), heap_offset))
+        f.write(index)
+        f.write(heap)
+    tmp.replace(path)
+
+    return len(items)
+
+# ---------------------------------------------------
+# Read-only mmap view
+# ---------------------------------------------------
+
+class CatalogSnapshot:
+    """
+    Read-only view of a compiled catalog. The file is mapped, not
+    loaded, so worker processes share the page cache and opening is
+    constant time regardless of catalog size.
+    """
+
+    def __init__(self, path=SNAPSHOT_FILE):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, heap_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a catalog snapshot: {path}")
+
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def _entry(self, i):
+        return ENTRY.unpack_from(self._mm, HEADER.size + i * ENTRY.size)
+
+    def _key(self, i):
+        key_off, key_len, _, _ = self._entry(i)
+        return self._mm[key_off:key_off + key_len]
+
+    def _find(self, key):
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._key(lo) == key:
+            return lo
+        return None
+
+    def get(self, key, default=None):
+        i = self._find(key.encode("utf-8"))
+        if i is None:
+            return default
+        _, _, val_off, val_len = self._entry(i)
+        return json.loads(self._mm[val_off:val_off + val_len])
+
+    def part(self, part_no):
+        return self.get(part_key(part_no))
+
+    def describe(self, section, code):
+        section = chart_codes.section_name(section)
+        return self.get(chart_key(section, code))
+
+# ---------------------------------------------------
+# RUN
+# ---------------------------------------------------
+
+if __name__ == "__main__":
+    count = compile_snapshot(build_catalog_entries())
+    print(f"✅ Compiled {count} catalog entries to {SNAPSHOT_FILE}")
+
+    if len(sys.argv) > 1:
+        with CatalogSnapshot(SNAPSHOT_FILE) as catalog:
+            print(json.dumps(catalog.part(sys.argv[1]), indent=2))
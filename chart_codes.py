@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+# Model code layout and chart loading, with no third-party imports so
+# readers such as catalog_snapshot can use them without loading pandas
+
+# ---------------------------------------------------
+# Positional layout of a model code (dashes removed)
+#
+#   PD03 P - A D S - D A A - A 0 0
+#   |    |   | | |   | | |   | | |
+#   |    |   | | |   | | |   | | Specialty Code 2
+#   |    |   | | |   | | |   | Specialty Code 1
+#   |    |   | | |   | | |   Revision
+#   |    |   | | |   | | Diaphragm / O-Ring Material
+#   |    |   | | |   | Check Material
+#   |    |   | | |   Seat / Spacer Material
+#   |    |   | | Hardware Material
+#   |    |   | Fluid Caps / Manifold Material
+#   |    |   Connection
+#   |    Center Body Material
+#   Model Series
+# ---------------------------------------------------
+
+MODEL_CODE_FIELDS = [
+    ("Model Series", 4),
+    ("Center Body Material", 1),
+    ("Connection", 1),
+    ("Fluid Caps / Manifold Material", 1),
+    ("Hardware Material", 1),
+    ("Seat / Spacer Material", 1),
+    ("Check Material", 1),
+    ("Diaphragm / O-Ring Material", 1),
+    ("Revision", 1),
+    ("Specialty Code 1", 1),
+    ("Specialty Code 2", 1),
+]
+
+# Section names the chart extractors wrote before they shared
+# model_chart's canonical names, still found in older chart JSON
+CHART_SECTION_ALIASES = {
+    "Seat Material": "Seat / Spacer Material",
+    "Ball Material": "Check Material",
+    "Diaphragm Material": "Diaphragm / O-Ring Material",
+}
+
+# Stripped from model codes before slicing them into fields
+CODE_SEPARATORS = r"[\s\-]"
+
+# ---------------------------------------------------
+# Chart loading
+# ---------------------------------------------------
+
+def section_name(section):
+    """Canonical chart section name for any extractor's spelling."""
+    return CHART_SECTION_ALIASES.get(section, section)
+
+
+def load_chart(chart):
+    """
+    Return {section: {code: description}} from either chart format:
+    riad / model_description  -> {section: [{"code", "description"}]}
+    model_description11       -> {section: {code: description}}
+    """
+    if isinstance(chart, (str, Path)):
+        with open(chart, "r", encoding="utf-8") as f:
+            chart = json.load(f)
+
+    lookup = {}
+    for section, entries in chart.items():
+        section = section_name(section)
+        if isinstance(entries, dict):
+            codes = entries
+        else:
+            codes = {e["code"]: e["description"] for e in entries}
+        lookup.setdefault(section, {}).update(codes)
+
+    return lookup
@@ -69,7 +69,7 @@ def find_header_row(df):
 # --------------------------------------------------
 def convert_wide_table_to_json(df):
 
-    df = df.applymap(clean_text)
+    df = df.map(clean_text)
 
     # ---- Detect header row ----
     header_index = find_header_row(df)
@@ -1,145 +1,249 @@
 import pdfplumber
 import re
 import json
-import cv2
-import numpy as np
-import easyocr
+
+import layout
+import ocr_regions
+import page_router
 
 PDF_PATH = "PX03P.pdf"
 OUTPUT_JSON = "common_parts.json"
 
+# Header labels of the COMMON PARTS table; column boundaries are
+# inferred from where these sit on the page
+COLUMN_LABELS = ("Item", "Description", "Qty", "Part", "Mtl")
+
+# A table title: one line of capitals, e.g. "AIR MOTOR PARTS LIST"
+SECTION_TITLE = re.compile(r"[A-Z][A-Z0-9 /&\-]*\s[A-Z0-9 /&\-]*[A-Z0-9]")
+
 def parse_part(text):
     """
     Extract part number and material from:
-    97122 [SS] or 23981632 [ P ]
+    97122 [SS], 23981632 [ P ], 96605-1 [P] or Y5-107-T [Co]
     """
-    m = re.search(r"(\d+)\s*\[\s*([A-Z]+)\s*\]", text)
+    m = re.search(r"([A-Z0-9][A-Z0-9\-]*)\s*\[\s*([A-Za-z]+)\s*\]", text)
     if m:
         return m.group(1), m.group(2)
     return None, None
 
-def extract_common_parts_pdfplumber(pdf_path):
-    """Try extracting COMMON PARTS using pdfplumber (text PDF)."""
+def common_parts_record(cells, seen):
+    """
+    One COMMON PARTS record from {column label: cell text}, or None if
+    the row is not a new part line. `seen` holds (item, part_no) keys
+    already returned and is updated in place.
+    """
+    # Item numbers can carry a leading service-kit glyph ("\uf0ab 70",
+    # "o 1" where the symbol font maps to a letter)
+    m = re.fullmatch(r"\D*?(\d+)", cells["Item"].strip())
+    part_no, material = parse_part(cells["Part"] + " " + cells["Mtl"])
+    if not m or not part_no or not material:
+        return None
+    item = m.group(1)
+
+    key = (item, part_no)
+    if key in seen:
+        return None
+    seen.add(key)
+
+    return {
+        "item": item,
+        "description": " ".join(cells["Description"].split()),
+        "qty": cells["Qty"].strip().strip("()"),
+        "part_no": part_no,
+        "material": material
+    }
+
+def table_columns(row):
+    """
+    Column index of every label in a table header row, one
+    {label: index} dict per side-by-side table half, or [] if the row
+    is not a COMMON PARTS header ('Part No.' and '[Mtl]' match too).
+    """
+    wanted = {layout.header_label(label): label for label in COLUMN_LABELS}
+    halves = [{}]
+
+    for i, cell in enumerate(row):
+        first = (cell or "").split()[:1]
+        label = wanted.get(layout.header_label(first[0])) if first else None
+        if label is None:
+            continue
+        if label in halves[-1]:
+            halves.append({})
+        halves[-1][label] = i
+
+    return [h for h in halves if len(h) == len(COLUMN_LABELS)]
+
+def table_title(title, matrix):
+    """
+    Section title of a table: the text found above it, else a first
+    row holding a single capitalized cell. None for untitled tables
+    (continuations).
+    """
+    if title and SECTION_TITLE.fullmatch(title.strip()):
+        return title.strip()
+
+    for row in matrix:
+        cells = [c.strip() for c in row if c and c.strip()]
+        if cells:
+            if len(cells) == 1 and SECTION_TITLE.fullmatch(cells[0]):
+                return cells[0]
+            return None
+    return None
+
+def parse_common_parts_words(pages):
+    """
+    Parse COMMON PARTS rows from an iterable of (page_text, words),
+    where words are extract_words() style dicts from the text layer
+    or from OCR.
+    """
     results = []
     capture = False
     seen = set()
+    names = edges = None
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            # Check for section start
-            if re.search(r"COMMON\s+PARTS", text, re.IGNORECASE):
-                capture = True
+    for text, words in pages:
+        # Check for section start
+        if re.search(r"COMMON\s+PARTS", text, re.IGNORECASE):
+            capture = True
 
-            if not capture:
-                continue
+        if not capture:
+            continue
 
-            # Get words with coordinates
-            words = page.extract_words(use_text_flow=True)
-            if not words:
-                continue
+        if not words:
+            continue
 
-            rows = {}
-            for w in words:
-                y = int(round(w["top"]))
-                rows.setdefault(y, []).append(w)
+        rows = layout.group_rows(words)
 
-            for y in sorted(rows):
-                row = rows[y]
-                row_text = " ".join(w["text"] for w in row)
+        for i, row in enumerate(rows):
+            row_text = " ".join(w["text"] for w in row)
 
-                # Optional: stop at next section
-                if re.search(r"MANIFOLD\s*/\s*FLUID CAP OPTIONS", row_text, re.IGNORECASE):
-                    return results
+            # Columns carry over to continuation pages without a header
+            if layout.is_header_row(row, COLUMN_LABELS):
+                names, edges = layout.column_edges(rows, COLUMN_LABELS, i)
+                continue
 
-                # Row must start with item number
-                if not re.match(r"^\d+\b", row_text):
-                    continue
+            # Optional: stop at next section
+            if re.search(r"MANIFOLD\s*/\s*FLUID CAP OPTIONS", row_text, re.IGNORECASE):
+                return results
 
-                # Split row into columns (roughly by x-position)
-                item = desc = qty = part_txt = ""
-                for w in row:
-                    x = w["x0"]
-                    txt = w["text"]
-                    if x < 50:
-                        item += txt
-                    elif 50 <= x < 260:
-                        desc += " " + txt
-                    elif 260 <= x < 330:
-                        qty += txt
-                    else:
-                        part_txt += " " + txt
-
-                part_no, material = parse_part(part_txt)
-                if not item.strip().isdigit() or not part_no or not material:
-                    continue
+            # Row must start with item number
+            if not re.match(r"^\d+\b", row_text):
+                continue
 
-                key = (item.strip(), part_no)
-                if key in seen:
-                    continue
-                seen.add(key)
-
-                results.append({
-                    "item": item.strip(),
-                    "description": desc.strip(),
-                    "qty": qty.strip().strip("()"),
-                    "part_no": part_no,
-                    "material": material
-                })
+            if edges is None:
+                continue
+
+            # Split row into columns by x-position
+            cells = {name: [] for name in COLUMN_LABELS}
+            for w, col in zip(row, layout.column_ids(row, edges)):
+                if col < len(names):
+                    cells[names[col]].append(w["text"])
+
+            record = common_parts_record({
+                "Item": "".join(cells["Item"]),
+                "Description": " ".join(cells["Description"]),
+                "Qty": "".join(cells["Qty"]),
+                "Part": " ".join(cells["Part"]),
+                "Mtl": " ".join(cells["Mtl"]),
+            }, seen)
+            if record:
+                results.append(record)
     return results
 
-def extract_common_parts_ocr(pdf_path):
-    """Fallback: use OCR + table detection if pdfplumber fails."""
+def parse_common_parts_tables(tables):
+    """
+    Parse COMMON PARTS rows from an iterable of (page_number, title,
+    matrix) in page order, where matrix is an extract_tables() style
+    list of rows (text layer or ocr_table.build_table) and title is any
+    text found above the table. A table titled COMMON PARTS, above it
+    or in its first row, starts capture; a table with any other title
+    or a new page ends it; untitled tables on the same page continue it.
+    """
     results = []
-    reader = easyocr.Reader(['en'], gpu=False)
-    
-    # Convert each PDF page to image
-    import pdf2image
-    pages = pdf2image.convert_from_path(pdf_path, dpi=300)
-
-    for page_num, img in enumerate(pages):
-        img_np = np.array(img)
-        gray = cv2.cvtColor(img_np, cv2.COLOR_RGB2GRAY)
-
-        # OCR detection
-        ocr_results = reader.readtext(gray)
-
-        # Simple heuristic: look for COMMON PARTS section
-        capture = False
-        seen = set()
-        for bbox, text, conf in ocr_results:
-            if re.search(r"COMMON\s+PARTS", text, re.IGNORECASE):
-                capture = True
-                continue
-            if not capture:
+    capture = False
+    seen = set()
+    columns = []
+    items = []
+    current_page = None
+
+    for page_no, title, matrix in tables:
+        if page_no != current_page:
+            current_page = page_no
+            capture = False
+
+        name = table_title(title, matrix)
+        if name:
+            capture = bool(re.search(r"COMMON\s+PARTS", name, re.IGNORECASE))
+            columns = []
+            items = []
+
+        if not capture:
+            continue
+
+        for row in matrix:
+            cells = [(c or "").strip() for c in row]
+            row_text = " ".join(c for c in cells if c)
+
+            if re.search(r"MANIFOLD\s*/\s*FLUID CAP OPTIONS", row_text, re.IGNORECASE):
+                return results
+
+            # Columns carry over to continuation tables without a header
+            header = table_columns(cells)
+            if header:
+                columns = header
+                items = [""] * len(columns)
                 continue
-            if re.search(r"MANIFOLD\s*/\s*FLUID CAP OPTIONS", text, re.IGNORECASE):
-                break
-
-            # Extract item, description, qty, part
-            m = re.match(r"(\d+)\s+(.*?)\s+(\d+)\s+(.*)", text)
-            if m:
-                item, desc, qty, part_txt = m.groups()
-                part_no, material = parse_part(part_txt)
-                if part_no and material:
-                    key = (item, part_no)
-                    if key not in seen:
-                        seen.add(key)
-                        results.append({
-                            "item": item,
-                            "description": desc.strip(),
-                            "qty": qty.strip(),
-                            "part_no": part_no,
-                            "material": material
-                        })
+
+            for k, half in enumerate(columns):
+                if max(half.values()) >= len(cells):
+                    continue
+                row_cells = {label: cells[i] for label, i in half.items()}
+
+                # A blank Item is another part no. of the item above ("other models")
+                if row_cells["Item"]:
+                    items[k] = row_cells["Item"]
+                else:
+                    row_cells["Item"] = items[k]
+
+                record = common_parts_record(row_cells, seen)
+                if record:
+                    results.append(record)
+
     return results
 
+def extract_common_parts_pdfplumber(pdf_path):
+    """Try extracting COMMON PARTS using pdfplumber (text PDF)."""
+    with pdfplumber.open(pdf_path) as pdf:
+        return parse_common_parts_words(
+            (page.extract_text() or "", page.extract_words(use_text_flow=True))
+            for page in pdf.pages
+        )
+
+def extract_common_parts_hybrid(pdf_path):
+    """
+    Route each page to its text layer or to region OCR (missing or
+    garbled text layer) and parse both through the same word parser.
+    """
+    return parse_common_parts_words(
+        (page["text"], page["words"])
+        for page in page_router.iter_page_words(pdf_path)
+    )
+
+def extract_common_parts_ocr(pdf_path, drop_low_conf=True):
+    """
+    Fallback: OCR only the table regions (vector table boxes, or
+    header bands from a low-DPI pass) rendered at 300 DPI, rebuild each
+    as a cell matrix from the token boxes and parse it like a
+    text-layer table. Low-confidence tokens are dropped, so a misread
+    part number skips its row rather than being reported.
+    """
+    return parse_common_parts_tables(
+        ocr_regions.ocr_pdf_tables(pdf_path, drop_low_conf=drop_low_conf)
+    )
+
 if __name__ == "__main__":
-    # First try pdfplumber
-    data = extract_common_parts_pdfplumber(PDF_PATH)
-    if not data:
-        print("⚠️ pdfplumber failed, falling back to OCR...")
-        data = extract_common_parts_ocr(PDF_PATH)
+    # Text-layer pages via pdfplumber, scanned / garbled pages via OCR
+    data = extract_common_parts_hybrid(PDF_PATH)
 
     # Save JSON
     with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
@@ -2,6 +2,8 @@ import pandas as pd
 import re
 import json
 
+import layout
+
 # -----------------------------
 # HELPERS
 # -----------------------------
@@ -47,41 +49,30 @@ def find_header_row(table):
     return None
 
 
-# -----------------------------
-# SPLIT SIDE-BY-SIDE TABLES
-# -----------------------------
-def split_table(table, header_idx):
-    """Split table into left/right if side-by-side columns detected"""
-    header = table[header_idx]
-    data = table[header_idx + 1:]
-
-    normalized = [normalize(h) for h in header]
-    half = len(header) // 2
-
-    # Detect repeated headers (side-by-side table)
-    if half > 0 and normalized[:half] == normalized[half:]:
-        left_df = pd.DataFrame([r[:half] for r in data], columns=header[:half])
-        right_df = pd.DataFrame([r[half:] for r in data], columns=header[half:])
-        return [left_df, right_df]
-
-    return [pd.DataFrame(data, columns=header)]
-
-
 # -----------------------------
 # EXTRACT COMMON PARTS
 # -----------------------------
 def extract_common_parts(table):
+    """
+    Records from one COMMON PARTS table; side-by-side halves arrive as
+    separate tables (see layout.region_tables).
+    """
     results = []
 
     header_idx = find_header_row(table)
     if header_idx is None:
         return []
 
-    dfs = split_table(table, header_idx)
+    header = table[header_idx]
+    dfs = [pd.DataFrame(table[header_idx + 1:], columns=header)]
 
     for df in dfs:
         df.columns = [normalize(c) for c in df.columns]
 
+        # Repeated Part No./[Mtl] columns: a MANIFOLD variant grid
+        if df.columns.duplicated().any():
+            continue
+
         # Map columns dynamically
         try:
             col_map = {
@@ -126,6 +117,15 @@ def extract_common_parts(table):
     return results
 
 
+def extract_common_parts_from_page(page):
+    """COMMON PARTS records from a pdfplumber page."""
+    return [
+        record
+        for table in layout.region_tables(page)
+        for record in extract_common_parts(table)
+    ]
+
+
 # -----------------------------
 # EXTRACT JSON
 # -----------------------------
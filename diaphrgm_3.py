@@ -42,7 +42,7 @@ def extract_diaphragm_options(df):
         axis=1
     )].index[0]
 
-    header = df.iloc[header_idx]
+    header = df.iloc[header_idx].tolist()
 
     # detect column groups dynamically
     groups = []
@@ -70,7 +70,7 @@ def extract_diaphragm_options(df):
     # data rows
     table = df.iloc[header_idx + 1:].reset_index(drop=True)
 
-    for _, row in table.iterrows():
+    for row in table.itertuples(index=False, name=None):
 
         model_code = str(row[0]).strip()
 
@@ -2,6 +2,8 @@ import pdfplumber
 import re
 import json
 
+import layout
+
 PDF_FILE = "manual.pdf"
 
 def extract_common_parts(pdf_path):
@@ -12,12 +14,8 @@ def extract_common_parts(pdf_path):
         full_text = ""
         for page_num, page in enumerate(pdf.pages, 1):
             words = page.extract_words()
-            # Group words by 'top' coordinate to reconstruct lines
-            lines_dict = {}
-            for w in words:
-                top = round(float(w['top']))
-                lines_dict.setdefault(top, []).append(w['text'])
-            lines = [" ".join(sorted(lines_dict[top], key=lambda x: x)) for top in sorted(lines_dict.keys())]
+            # Group words into lines by vertical position, left to right
+            lines = [" ".join(w['text'] for w in row) for row in layout.group_rows(words)]
             full_text += "\n".join(lines) + "\n"
 
     # Step 2: Find COMMON PARTS block
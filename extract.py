@@ -0,0 +1,158 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Nothing heavy is imported here: pandas, pdfplumber and the section
+# parsers load inside extract_page(), so --help and --startup stay cheap
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+SECTIONS = ("common_parts", "mainfold", "dipram", "ball", "seat")
+
+# What a single-page run imports before it touches the PDF
+STARTUP_MODULES = ("table_count_111",)
+
+# python -X importtime budget for STARTUP_MODULES, in milliseconds
+STARTUP_BUDGET_MS = float(os.environ.get("EXTRACT_STARTUP_BUDGET_MS", "800"))
+
+# Modules listed in the --startup report
+TOP_IMPORTS = 12
+
+# "import time: <self us> | <cumulative us> | <indent><module>"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+# ---------------------------------------------------
+# Extraction
+# ---------------------------------------------------
+
+def extract_page(pdf_path, page_number, sections=None):
+    """
+    Parsed sections of one page. With `sections`, tables of any other
+    type are skipped before parsing, so their parsers are never imported.
+    """
+    import table_count_111
+
+    dfs = table_count_111.extract_tables_as_dataframes(pdf_path, page_number)
+    return parse_dataframes(dfs, sections)
+
+
+def parse_dataframes(dfs, sections=None):
+    """Classify a page's DataFrames and parse the requested sections."""
+    import table_count_111
+
+    kinds = [table_count_111.classify_table(df) for df in dfs]
+
+    if sections:
+        kinds = [kind if kind in sections else None for kind in kinds]
+
+    # The section parsers print their intermediate frames
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = table_count_111.parse_all_tables(dfs, kinds)
+
+    if sections:
+        result = {name: value for name, value in result.items() if name in sections}
+    return result
+
+
+def extract_pages(pdf_path, page_numbers, sections=None):
+    return {page_no: extract_page(pdf_path, page_no, sections) for page_no in page_numbers}
+
+# ---------------------------------------------------
+# Startup budget
+# ---------------------------------------------------
+
+def import_times(modules=STARTUP_MODULES):
+    """
+    Run `python -X importtime -c "import ..."` in a fresh interpreter
+    and return one row per imported module, in import order.
+    """
+    code = "; ".join(f"import {name}" for name in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=Path(__file__).resolve().parent,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {', '.join(modules)} failed:\n{proc.stderr.strip()}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = IMPORTTIME_LINE.match(line)
+        if m:
+            self_us, cumulative_us, indent, name = m.groups()
+            rows.append({
+                "module": name,
+                "depth": len(indent) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            })
+    return rows
+
+
+def startup_report(modules=STARTUP_MODULES, budget_ms=STARTUP_BUDGET_MS):
+    rows = import_times(modules)
+    # Top-level rows include the interpreter's own startup imports (site, encodings)
+    total = sum(r["cumulative_ms"] for r in rows if r["depth"] == 0)
+    slowest = sorted((r for r in rows if r["depth"] <= 1), key=lambda r: r["cumulative_ms"], reverse=True)
+
+    return {
+        "modules": list(modules),
+        "total_ms": total,
+        "budget_ms": budget_ms,
+        "over_budget": total > budget_ms,
+        "slowest": slowest[:TOP_IMPORTS],
+    }
+
+
+def format_startup(report):
+    lines = [f"{'module':<40} {'cumulative ms':>14} {'self ms':>9}"]
+    for r in report["slowest"]:
+        lines.append(f"{'  ' * r['depth'] + r['module']:<40} {r['cumulative_ms']:>14.1f} {r['self_ms']:>9.1f}")
+    status = "OVER" if report["over_budget"] else "ok"
+    lines.append(f"\nimport {', '.join(report['modules'])}: {report['total_ms']:.0f} ms "
+                 f"(budget {report['budget_ms']:.0f} ms) {status}")
+    return "\n".join(lines)
+
+# ---------------------------------------------------
+# RUN
+# ---------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract the parts tables of manual pages as JSON.")
+    parser.add_argument("pdf", nargs="?")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1], help="1-based page numbers")
+    parser.add_argument("--sections", nargs="+", choices=SECTIONS, help="only parse these sections")
+    parser.add_argument("--output", type=Path, help="write JSON here instead of stdout")
+    parser.add_argument("--startup", action="store_true",
+                        help="measure import time with python -X importtime and check it against the budget")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="startup budget (default: EXTRACT_STARTUP_BUDGET_MS or %(default)s)")
+    args = parser.parse_args()
+
+    if args.startup:
+        report = startup_report(budget_ms=args.budget_ms)
+        print(format_startup(report))
+        sys.exit(1 if report["over_budget"] else 0)
+
+    if not args.pdf:
+        parser.error("a PDF is required unless --startup is given")
+
+    result = extract_pages(args.pdf, args.pages, args.sections)
+    payload = json.dumps(result, indent=2, default=str)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(payload, encoding="utf-8")
+    else:
+        print(payload)
+
+    import instrument
+    if instrument.ENABLED:
+        print(instrument.format_report(), file=sys.stderr)
@@ -99,4 +99,5 @@ def pdf_to_json(pdf_path, output_dir="output"):
 # --------------------------------------------------
 # RUN
 # --------------------------------------------------
-pdf_to_json("PX03P.pdf")
+if __name__ == "__main__":
+    pdf_to_json("PX03P.pdf")
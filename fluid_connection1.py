@@ -64,10 +64,7 @@ def extract_parts_from_table(table, pdf_name, page_no):
 # --------------------------------------------------
 # PROCESS ONE PDF (PAGE NUMBER ADDED)
 # --------------------------------------------------
-def pdf_to_json(pdf_path, page_numbers, output_dir="output"):
-    output_dir = Path(output_dir)
-    output_dir.mkdir(exist_ok=True)
-
+def extract_parts_from_pdf(pdf_path, page_numbers):
     if isinstance(page_numbers, int):
         page_numbers = [page_numbers]
 
@@ -95,6 +92,15 @@ def pdf_to_json(pdf_path, page_numbers, output_dir="output"):
 
                 all_rows.extend(extracted)
 
+    return all_rows
+
+
+def pdf_to_json(pdf_path, page_numbers, output_dir="output"):
+    output_dir = Path(output_dir)
+    output_dir.mkdir(exist_ok=True)
+
+    all_rows = extract_parts_from_pdf(pdf_path, page_numbers)
+
     # Save single JSON
     json_path = output_dir / f"{Path(pdf_path).stem}_parts.json"
     with open(json_path, "w", encoding="utf-8") as f:
@@ -107,5 +113,5 @@ def pdf_to_json(pdf_path, page_numbers, output_dir="output"):
 # --------------------------------------------------
 # RUN (DEFINE TABLE PAGE HERE)
 # --------------------------------------------------
-pdf_to_json("manual.pdf", page_numbers=5)
-
+if __name__ == "__main__":
+    pdf_to_json("manual.pdf", page_numbers=5)
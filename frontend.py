@@ -0,0 +1,407 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import service
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+PORT = 8766
+
+# Extraction processes. Default: one per CPU.
+WORKERS = int(os.environ.get("EXTRACT_WORKERS", "0")) or os.cpu_count() or 1
+
+# Jobs in the pool at once. Further page jobs wait for a slot, and new
+# requests get 429 while the pool is full or pages are waiting
+MAX_QUEUE_DEPTH = int(os.environ.get("EXTRACT_MAX_QUEUE", "0")) or 4 * WORKERS
+
+# Seconds a client told 429 should wait before retrying
+RETRY_AFTER_S = 2
+
+# Uploaded PDFs are written here so workers open them by path
+# instead of receiving the bytes with every page job
+SPOOL_DIR = Path(os.environ.get("EXTRACT_SPOOL_DIR", "output/spool"))
+
+# Open documents each worker keeps between page jobs
+OPEN_DOCUMENTS = 4
+
+# ---------------------------------------------------
+# Worker processes
+# ---------------------------------------------------
+
+_documents = OrderedDict()
+
+
+def _init_worker(warm_ocr):
+    service.warm_imports(warm_ocr)
+
+
+def _ready():
+    return os.getpid()
+
+
+def _open_document(path):
+    """pdfplumber + pdfium handles for a spooled PDF, reused across pages."""
+    import pdfplumber
+    import pypdfium2 as pdfium
+
+    docs = _documents.get(path)
+    if docs is None:
+        docs = _documents[path] = (pdfplumber.open(path), pdfium.PdfDocument(path))
+        while len(_documents) > OPEN_DOCUMENTS:
+            _, (pdf, pdfium_doc) = _documents.popitem(last=False)
+            pdf.close()
+            pdfium_doc.close()
+    _documents.move_to_end(path)
+    return docs
+
+
+def tables_job(path, page_no):
+    """Table matrices of one page (the CPU-heavy step)."""
+    import page_router
+
+    pdf, pdfium_doc = _open_document(path)
+    page = pdf.pages[page_no - 1]
+    pdfium_page = pdfium_doc[page_no - 1]
+    try:
+        return page_router.extract_tables(page, pdfium_page)
+    finally:
+        pdfium_page.close()
+        page.close()
+
+
+def parse_job(tables, sections):
+    import extract
+    import table_count_111
+
+    return extract.parse_dataframes(table_count_111.tables_to_dataframes(tables), sections)
+
+
+def page_count(data):
+    import pypdfium2 as pdfium
+
+    doc = pdfium.PdfDocument(data)
+    try:
+        return len(doc)
+    finally:
+        doc.close()
+
+# ---------------------------------------------------
+# Single-flight
+# ---------------------------------------------------
+
+class SingleFlight:
+    """
+    Runs one task per key; callers asking for a key already in flight
+    await the same task. Shielded, so a caller that goes away does not
+    cancel work other callers are waiting on; the task is cancelled when
+    the last caller waiting on it goes away.
+    """
+
+    def __init__(self):
+        self.flights = {}
+        self.waiters = Counter()
+        self.shared = 0
+
+    def _forget(self, key, task):
+        if self.flights.get(key) is task:
+            del self.flights[key]
+
+    async def do(self, key, start):
+        task = self.flights.get(key)
+        if task is None:
+            task = self.flights[key] = asyncio.ensure_future(start())
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self.shared += 1
+
+        self.waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self.waiters[key] -= 1
+            if self.waiters[key] <= 0:
+                del self.waiters[key]
+                if not task.done():
+                    # Nobody left to use the result; a new caller starts afresh
+                    self._forget(key, task)
+                    task.cancel()
+
+# ---------------------------------------------------
+# Front-end
+# ---------------------------------------------------
+
+class Frontend:
+    """
+    POST /extract?sections=...&pages=...
+        body: the PDF bytes. Responds with NDJSON, one line per parsed
+        section as its page finishes ({"page", "section", "result"}),
+        {"page", "error"} for failed pages and a final {"done": true}
+        summary. 429 with Retry-After while the pool is full or page
+        jobs are waiting for it.
+    GET /health
+        pool, queue, single-flight and cache counters
+
+    Table finding and parsing run in a process pool. Identical work in
+    flight (same PDF hash and page, same sections) is done once and
+    shared. Table matrices are cached per (PDF hash, page) as in
+    service.Extractor.
+    """
+
+    def __init__(self, workers=WORKERS, max_queue=MAX_QUEUE_DEPTH,
+                 cache_pages=service.CACHE_PAGES, warm_ocr=service.WARM_OCR):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.warm_ocr = warm_ocr
+        self.pool = None
+        self.tables = service.LRU(cache_pages)
+        self.page_counts = service.LRU(cache_pages)
+        self.flights = SingleFlight()
+        self.spool_refs = Counter()
+        self.slots = asyncio.Semaphore(max_queue)
+        self.queued = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.requests = 0
+        self.started = time.time()
+
+    async def start(self):
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.warm_ocr,))
+        # Workers start (and warm up) with the first job
+        await self.submit(_ready)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+        for digest in list(self.spool_refs):
+            (SPOOL_DIR / f"{digest}.pdf").unlink(missing_ok=True)
+
+    async def submit(self, func, *args):
+        """
+        Run func in the pool once one of the max_queue slots is free. The
+        slot is held until the job leaves the pool: cancelling a caller
+        drops a job that has not started, but waits out a running one.
+        """
+        self.waiting += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.queued += 1
+        try:
+            job = self.pool.submit(func, *args)
+            try:
+                return await asyncio.wrap_future(job)
+            except asyncio.CancelledError:
+                if not job.cancel():
+                    await asyncio.wait([asyncio.wrap_future(job)])
+                raise
+        finally:
+            self.queued -= 1
+            self.slots.release()
+
+    # ---- spooled uploads ----
+
+    async def spool(self, digest, data):
+        path = SPOOL_DIR / f"{digest}.pdf"
+        self.spool_refs[digest] += 1
+
+        def write():
+            if not path.exists():
+                SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(data)
+                tmp.replace(path)
+
+        await self.flights.do(("spool", digest), lambda: asyncio.to_thread(write))
+        return path
+
+    def release(self, digest):
+        self.spool_refs[digest] -= 1
+        if self.spool_refs[digest] <= 0:
+            del self.spool_refs[digest]
+            (SPOOL_DIR / f"{digest}.pdf").unlink(missing_ok=True)
+
+    # ---- page work ----
+
+    async def page_tables(self, digest, path, page_no):
+        key = (digest, page_no)
+        tables = self.tables.get(key)
+        if tables is not None:
+            return tables
+
+        async def start():
+            # The job reads the spooled file, which stays until it is done
+            self.spool_refs[digest] += 1
+            try:
+                tables = await self.submit(tables_job, str(path), page_no)
+            finally:
+                self.release(digest)
+            self.tables.put(key, tables)
+            return tables
+
+        return await self.flights.do(("tables", *key), start)
+
+    async def page_result(self, digest, path, page_no, sections):
+        async def start():
+            tables = await self.page_tables(digest, path, page_no)
+            return await self.submit(parse_job, tables, sections)
+
+        return await self.flights.do(("parse", digest, page_no, tuple(sections or ())), start)
+
+    async def stream(self, send, digest, path, pages, page_total, sections):
+        """Send one NDJSON line per section as pages finish, then a summary."""
+        async def line(payload):
+            body = json.dumps(payload, default=str).encode("utf-8") + b"\n"
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+
+        started = time.perf_counter()
+        failures = 0
+        pending = {}
+
+        for page_no in pages:
+            if 1 <= page_no <= page_total:
+                pending[asyncio.ensure_future(self.page_result(digest, path, page_no, sections))] = page_no
+            else:
+                failures += 1
+                await line({"page": page_no, "error": f"no page {page_no} (PDF has {page_total})"})
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    page_no = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        failures += 1
+                        await line({"page": page_no, "error": f"{type(e).__name__}: {e}"})
+                        continue
+                    for section, value in result.items():
+                        await line({"page": page_no, "section": section, "result": value})
+
+            await line({
+                "done": True,
+                "pdf_sha256": digest,
+                "pages": len(pages),
+                "failures": failures,
+                "elapsed_s": time.perf_counter() - started,
+            })
+        finally:
+            # Client gone: stop waiting; flights no other request waits
+            # on are cancelled with it
+            for task in pending:
+                task.cancel()
+
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def extract(self, scope, receive, send):
+        backlog = self.queued + self.waiting
+        if backlog >= self.max_queue:
+            self.rejected += 1
+            raise service.HttpError(429, f"{backlog} page jobs queued or waiting (limit {self.max_queue})")
+
+        pages, sections = service.parse_request_options(scope.get("query_string", b""))
+        data = await service.read_body(receive)
+        if not data.startswith(b"%PDF"):
+            raise service.HttpError(400, "request body is not a PDF")
+
+        self.requests += 1
+        digest = await asyncio.to_thread(service.pdf_digest, data)
+
+        page_total = self.page_counts.get(digest)
+        if page_total is None:
+            try:
+                page_total = await asyncio.to_thread(page_count, data)
+            except Exception as e:
+                raise service.HttpError(400, f"unreadable PDF: {e}")
+            self.page_counts.put(digest, page_total)
+
+        path = await self.spool(digest, data)
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/x-ndjson")],
+            })
+            await self.stream(send, digest, path, pages or list(range(1, page_total + 1)), page_total, sections)
+        finally:
+            self.release(digest)
+
+    def health(self):
+        return {
+            "status": "ok",
+            "uptime_s": time.time() - self.started,
+            "workers": self.workers,
+            "queued": self.queued,
+            "waiting": self.waiting,
+            "max_queue": self.max_queue,
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "in_flight": len(self.flights.flights),
+            "shared_flights": self.flights.shared,
+            "table_cache": self.tables.stats(),
+        }
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await asyncio.to_thread(self.close)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+
+        method, path = scope["method"], scope["path"]
+        try:
+            if path == "/health" and method == "GET":
+                return await service.send_json(send, 200, self.health())
+            if path == "/extract" and method == "POST":
+                return await self.extract(scope, receive, send)
+            raise service.HttpError(404, f"no route {method} {path}")
+
+        except service.HttpError as e:
+            headers = [(b"retry-after", str(RETRY_AFTER_S).encode())] if e.status == 429 else []
+            await service.send_json(send, e.status, {"error": str(e)}, headers)
+
+
+app = Frontend()
+
+# ---------------------------------------------------
+# RUN
+# ---------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Async extraction front-end with a worker pool and backpressure.")
+    parser.add_argument("--host", default=service.HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--uds", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--max-queue", type=int, help="jobs in the pool at once; more get 429 (default: 4 x workers)")
+    parser.add_argument("--cache-pages", type=int, default=service.CACHE_PAGES)
+    parser.add_argument("--warm-ocr", action="store_true", default=service.WARM_OCR,
+                        help="build the easyocr reader in every worker at startup")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = Frontend(args.workers, args.max_queue or 4 * args.workers, args.cache_pages, args.warm_ocr)
+
+    # One event loop process; the extraction workers are its pool
+    uvicorn.run(app, host=args.host, port=args.port, uds=args.uds, workers=1, log_level="info")
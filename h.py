@@ -95,6 +95,18 @@
 import pdfplumber
 import json
 
+import layout
+
+COLUMN_LABELS = ("Item", "Description", "Mtl", "Qty", "Part")
+
+
+def last_header_columns(page):
+    """Column names and edges of the last header row on a page, or (None, None)."""
+    rows = layout.group_rows(page.extract_words(use_text_flow=True))
+    headers = [i for i, row in enumerate(rows) if layout.is_header_row(row, COLUMN_LABELS)]
+    if not headers:
+        return None, None
+    return layout.column_edges(rows, COLUMN_LABELS, headers[-1])
 
 
 def extract_common_parts(pdf_path, page_number):
@@ -104,13 +116,21 @@ def extract_common_parts(pdf_path, page_number):
         page = pdf.pages[page_number]
         words = page.extract_words(use_text_flow=True)
 
-        rows = {}
-        for w in words:
-            y = round(w["top"], 1)
-            rows.setdefault(y, []).append(w)
+        rows = layout.group_rows(words)
+        names = edges = None
 
-        for y in sorted(rows):
-            row = rows[y]
+        # A table continued from the previous page has no header row here;
+        # its rows use the columns of the last header there
+        if page_number > 0:
+            names, edges = last_header_columns(pdf.pages[page_number - 1])
+
+        for i, row in enumerate(rows):
+            if layout.is_header_row(row, COLUMN_LABELS):
+                names, edges = layout.column_edges(rows, COLUMN_LABELS, i)
+                continue
+
+            if edges is None:
+                continue
 
             item = ""
             desc = ""
@@ -118,19 +138,22 @@ def extract_common_parts(pdf_path, page_number):
             qty = ""
             part = ""
 
-            for w in row:
-                x = w["x0"]
+            for w, col in zip(row, layout.column_ids(row, edges)):
+                if col == len(names):
+                    continue
+
+                name = names[col]
                 t = w["text"]
 
-                if 40 <= x < 90:
+                if name == "Item":
                     item += t
-                elif 90 <= x < 380:
+                elif name == "Description":
                     desc += " " + t
-                elif 380 <= x < 420:
+                elif name == "Mtl":
                     material = t
-                elif 420 <= x < 470:
+                elif name == "Qty":
                     qty = t.replace("[","").replace("]","")
-                elif x >= 470:
+                elif name == "Part":
                     part += t
 
             if item.strip().isdigit() and part.strip():
@@ -146,5 +169,6 @@ def extract_common_parts(pdf_path, page_number):
 
 
 # RUN
-data = extract_common_parts("manual_.pdf", 5)
-print(json.dumps(data, indent=2))
+if __name__ == "__main__":
+    data = extract_common_parts("manual_.pdf", 5)
+    print(json.dumps(data, indent=2))
@@ -1,8 +1,9 @@
 import json
-import pytesseract
-from PIL import Image
 import re
 import os
+import sys
+
+import tesseract_batch
 
 # -----------------------------
 # CONFIG
@@ -22,19 +23,19 @@ MATERIAL_MAP = {
 }
 
 # -----------------------------
-# OCR + SMART PARSER
+# OCR (batched + cached)
 # -----------------------------
-def extract_from_image(image_path):
-    if not os.path.exists(image_path):
-        print("❌ Image not found:", image_path)
-        return None
+def ocr_image_text(image_path, lang="eng"):
+    return tesseract_batch.ocr_images([image_path], lang=lang)[str(image_path)]
 
-    text = pytesseract.image_to_string(Image.open(image_path))
-    lines = text.splitlines()
 
+# -----------------------------
+# SMART PARSER
+# -----------------------------
+def parse_ocr_text(text):
     parts = []
 
-    for line in lines:
+    for line in text.splitlines():
         line = line.strip()
         if not line:
             continue
@@ -65,18 +66,55 @@ def extract_from_image(image_path):
 
     return parts if parts else None
 
+
+def extract_from_image(image_path, text=None):
+    if not os.path.exists(image_path):
+        print("❌ Image not found:", image_path)
+        return None
+
+    if text is None:
+        text = ocr_image_text(image_path)
+
+    return parse_ocr_text(text)
+
+
+def extract_from_images(image_paths, workers=1):
+    """
+    OCR many images with batched tesseract runs, returns
+    {image_path: (parts, ocr_text)}.
+    """
+    image_paths = [p for p in image_paths if os.path.exists(p)]
+    texts = tesseract_batch.ocr_images(image_paths, workers=workers)
+
+    return {path: (parse_ocr_text(text), text) for path, text in texts.items()}
+
 # -----------------------------
 # MAIN
 # -----------------------------
 def main():
-    data = extract_from_image(IMAGE_PATH)
+    image_paths = sys.argv[1:] or [IMAGE_PATH]
+
+    results = extract_from_images(image_paths, workers=os.cpu_count() or 1)
+
+    if not results:
+        print("❌ Image not found:", ", ".join(image_paths))
+        raise Exception("No data extracted from image")
+
+    output = {}
+
+    for path, (data, text) in results.items():
+        if not data:
+            # Reuse the OCR text from the parse pass for debugging
+            print(f"❌ No rows matched in {path}. Showing OCR text for debugging:\n")
+            print(text)
+            continue
+        output[path] = data
 
-    if not data:
-        print("❌ No rows matched. Showing OCR text for debugging:\n")
-        print(pytesseract.image_to_string(Image.open(IMAGE_PATH)))
+    if not output:
         raise Exception("No data extracted from image")
 
-    output = {"common_parts": data}
+    if len(image_paths) == 1:
+        output = {"common_parts": next(iter(output.values()))}
 
     with open(OUTPUT_JSON, "w") as f:
         json.dump(output, f, indent=2)
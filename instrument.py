@@ -0,0 +1,245 @@
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+# EXTRACT_TRACE=1 turns spans and counters on at import,
+# EXTRACT_TRACE=otel also exports every span to OpenTelemetry
+TRACE_ENV = os.environ.get("EXTRACT_TRACE", "0")
+
+# EXTRACT_TRACE_MEMORY=1 adds tracemalloc peak / net allocation per span
+# (several times slower, so off by default)
+TRACE_MEMORY_ENV = os.environ.get("EXTRACT_TRACE_MEMORY", "0")
+
+ENABLED = False
+
+TRACER_NAME = "product_extraction"
+
+# ---------------------------------------------------
+# Run state
+# ---------------------------------------------------
+
+_NULL_SPAN = contextlib.nullcontext()
+
+_spans = {}
+_counters = {}
+_started = None
+_tracer = None
+_memory = False
+
+# Spans currently open while memory tracing, outermost first
+_open = []
+
+MB = 1024 * 1024
+
+
+def reset():
+    global _started
+    _spans.clear()
+    _counters.clear()
+    _open.clear()
+    _started = time.time()
+
+
+def enable(otel=False, memory=False):
+    """
+    Start recording spans and counters, plus OpenTelemetry spans with
+    otel=True and tracemalloc allocation peaks with memory=True.
+    """
+    global ENABLED, _tracer, _memory
+
+    ENABLED = True
+    _tracer = otel_tracer() if otel else None
+    _memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    reset()
+
+
+def disable():
+    global ENABLED, _tracer, _memory
+    ENABLED = False
+    _tracer = None
+    if _memory:
+        tracemalloc.stop()
+    _memory = False
+
+# ---------------------------------------------------
+# OpenTelemetry
+# ---------------------------------------------------
+
+def otel_tracer():
+    """
+    Tracer for the current provider. When the application has not set
+    one, install an SDK provider exporting to OTLP if
+    OTEL_EXPORTER_OTLP_ENDPOINT is set, otherwise to the console.
+    """
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+
+    if not isinstance(trace.get_tracer_provider(), TracerProvider):
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        if os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT"):
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+            exporter = OTLPSpanExporter()
+        else:
+            from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+            exporter = ConsoleSpanExporter(out=sys.stderr)
+
+        provider = TracerProvider()
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+        trace.set_tracer_provider(provider)
+
+    return trace.get_tracer(TRACER_NAME)
+
+# ---------------------------------------------------
+# Spans and counters
+# ---------------------------------------------------
+
+def _note_peak(peak):
+    for open_span in _open:
+        if peak > open_span.mem_peak:
+            open_span.mem_peak = peak
+
+
+class Span:
+    """
+    Timed block. With memory tracing, the tracemalloc peak is reset on
+    every span entry; the peak seen so far is first pushed to all open
+    spans so nested spans do not hide their parents' peaks.
+    """
+
+    __slots__ = ("name", "attrs", "wall0", "cpu0", "otel", "mem0", "mem_peak")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.otel = None
+
+    def __enter__(self):
+        if _tracer is not None:
+            self.otel = _tracer.start_as_current_span(self.name, attributes=self.attrs)
+            self.otel.__enter__()
+
+        if _memory:
+            current, peak = tracemalloc.get_traced_memory()
+            _note_peak(peak)
+            tracemalloc.reset_peak()
+            self.mem0 = self.mem_peak = current
+            _open.append(self)
+
+        self.wall0 = time.perf_counter()
+        self.cpu0 = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall0
+        cpu = time.process_time() - self.cpu0
+
+        if _memory:
+            current, peak = tracemalloc.get_traced_memory()
+            _note_peak(peak)
+            _open.remove(self)
+
+        stats = _spans.get(self.name)
+        if stats is None:
+            stats = _spans[self.name] = {"calls": 0, "errors": 0, "wall_s": 0.0, "cpu_s": 0.0, "max_s": 0.0}
+
+        stats["calls"] += 1
+        stats["wall_s"] += wall
+        stats["cpu_s"] += cpu
+        if wall > stats["max_s"]:
+            stats["max_s"] = wall
+        if exc_type is not None:
+            stats["errors"] += 1
+
+        if _memory:
+            peak_mb = (self.mem_peak - self.mem0) / MB
+            stats["alloc_peak_mb"] = max(stats.get("alloc_peak_mb", 0.0), peak_mb)
+            stats["alloc_net_mb"] = stats.get("alloc_net_mb", 0.0) + (current - self.mem0) / MB
+
+        if self.otel is not None:
+            self.otel.__exit__(exc_type, exc, tb)
+        return False
+
+
+def span(name, **attrs):
+    """
+    Time a block:
+
+        with instrument.span("page.extract_tables", page=3):
+            ...
+
+    A shared no-op context manager when instrumentation is off.
+    """
+    if not ENABLED:
+        return _NULL_SPAN
+    return Span(name, attrs)
+
+
+def count(name, n=1):
+    if ENABLED:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def count_records(value):
+    """Records in a parser result: list items, or JSON string lists, summed over dicts."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return 1 if value.strip() else 0
+
+    if isinstance(value, list):
+        return len(value)
+
+    if isinstance(value, dict):
+        if any(isinstance(v, (list, dict, str)) for v in value.values()):
+            return sum(count_records(v) for v in value.values())
+        return 1 if value else 0
+
+    return 0
+
+# ---------------------------------------------------
+# Report
+# ---------------------------------------------------
+
+def report():
+    return {
+        "started": _started,
+        "elapsed_s": time.time() - _started if _started else 0.0,
+        "spans": {name: dict(stats) for name, stats in sorted(_spans.items())},
+        "counters": dict(sorted(_counters.items())),
+    }
+
+
+def write_report(path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report(), indent=2), encoding="utf-8")
+    return path
+
+
+def format_report(data=None):
+    data = data or report()
+    lines = [f"{'span':<28} {'calls':>6} {'wall s':>9} {'cpu s':>9} {'max s':>8}"]
+    for name, s in data["spans"].items():
+        line = f"{name:<28} {s['calls']:>6} {s['wall_s']:>9.3f} {s['cpu_s']:>9.3f} {s['max_s']:>8.3f}"
+        if "alloc_peak_mb" in s:
+            line += f"  peak {s['alloc_peak_mb']:.1f} MB, net {s['alloc_net_mb']:+.1f} MB"
+        lines.append(line)
+    for name, n in data["counters"].items():
+        lines.append(f"{name:<28} {n:>6}")
+    return "\n".join(lines)
+
+
+if TRACE_ENV not in ("", "0"):
+    enable(otel=TRACE_ENV == "otel", memory=TRACE_MEMORY_ENV not in ("", "0"))
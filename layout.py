@@ -0,0 +1,472 @@
+import re
+
+import numpy as np
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+# Words whose vertical centers are within this many points belong to
+# the same row (round(top) bucketing split rows whose baselines differ
+# by a fraction of a point)
+ROW_TOLERANCE = 3.0
+
+# Column boundaries may sit this far right of a header word's x0
+# (numbers are often set slightly left of their header)
+HEADER_SLACK = 2.0
+
+# Inferred column edges kept per layout signature
+COLUMN_CACHE_SIZE = 256
+
+# A gutter between side-by-side halves is a vertical strip at least
+# this wide (points) that every row of a band leaves clear, searched
+# for in this share of the page width
+GUTTER_MIN_WIDTH = 16.0
+GUTTER_SEARCH = (0.4, 0.6)
+
+# Rows with text on both sides of the gutter needed to split a band;
+# each side must span this share of the page width, so a lone
+# material code past a wide column gap does not count as a half
+MIN_SPLIT_ROWS = 3
+MIN_SIDE_SPAN = 0.08
+
+# ---------------------------------------------------
+# Word boxes -> arrays
+# ---------------------------------------------------
+
+def word_arrays(words):
+    """extract_words() dicts -> dict of float arrays (x0, x1, top, bottom)."""
+    n = len(words)
+    return {
+        key: np.fromiter((w[key] for w in words), dtype=float, count=n)
+        for key in ("x0", "x1", "top", "bottom")
+    }
+
+# ---------------------------------------------------
+# Rows
+# ---------------------------------------------------
+
+def row_order(words, tolerance=ROW_TOLERANCE):
+    """
+    Return (order, row_id): word indices sorted top-to-bottom then
+    left-to-right, and the row each of them falls in. Rows are split
+    wherever the gap between consecutive vertical centers exceeds
+    `tolerance`.
+    """
+    if not words:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+
+    arr = word_arrays(words)
+    cy = (arr["top"] + arr["bottom"]) / 2
+
+    by_y = np.argsort(cy, kind="stable")
+    row_id = np.concatenate(([0], np.cumsum(np.diff(cy[by_y]) > tolerance)))
+
+    # lexsort: last key is primary
+    within = np.lexsort((arr["x0"][by_y], row_id))
+    return by_y[within], row_id[within]
+
+
+def group_rows(words, tolerance=ROW_TOLERANCE):
+    """Words grouped into rows (top to bottom), each sorted by x0."""
+    order, row_id = row_order(words, tolerance)
+    if not len(order):
+        return []
+
+    bounds = np.flatnonzero(np.diff(row_id)) + 1
+    return [[words[i] for i in idx] for idx in np.split(order, bounds)]
+
+# ---------------------------------------------------
+# Columns
+# ---------------------------------------------------
+
+def column_ids(words, edges, anchor="x0"):
+    """
+    Column index of each word: 0 left of edges[0], i for
+    edges[i-1] <= x < edges[i], len(edges) right of the last edge.
+    anchor="center" places words by their horizontal center.
+    """
+    arr = word_arrays(words)
+    x = arr["x0"] if anchor == "x0" else (arr["x0"] + arr["x1"]) / 2
+    return np.searchsorted(np.asarray(edges, dtype=float), x, side="right")
+
+
+def cell_matrix(words, edges, tolerance=ROW_TOLERANCE, anchor="x0", joiner=" "):
+    """
+    Rows x (len(edges) + 1) matrix of cell strings; words falling in
+    the same cell are joined left to right.
+    """
+    order, row_id = row_order(words, tolerance)
+    if not len(order):
+        return []
+
+    cols = column_ids(words, edges, anchor)
+    n_rows = int(row_id[-1]) + 1
+    cells = [[[] for _ in range(len(edges) + 1)] for _ in range(n_rows)]
+
+    for i, r in zip(order, row_id):
+        cells[r][cols[i]].append(words[i]["text"])
+
+    return [[joiner.join(c) for c in row] for row in cells]
+
+# ---------------------------------------------------
+# Column inference
+# ---------------------------------------------------
+
+_COLUMN_CACHE = {}
+
+
+def header_label(text):
+    """'[Mtl]' -> 'mtl', 'No.' -> 'no'"""
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+
+def is_header_row(row, labels):
+    found = {header_label(w["text"]) for w in row}
+    return all(header_label(label) in found for label in labels)
+
+
+def header_columns(row, labels):
+    """
+    Header words naming one column each, left to right, for the first
+    occurrence of every label. Also returns the first header word of a
+    repeated label set (side-by-side table halves), or None.
+    """
+    wanted = {header_label(label): label for label in labels}
+    columns = []
+    seen = set()
+
+    for w in row:
+        key = header_label(w["text"])
+        if key not in wanted:
+            continue
+        if key in seen:
+            return columns, w
+        seen.add(key)
+        columns.append((wanted[key], w))
+
+    return columns, None
+
+
+def coverage_histogram(words, lo, hi):
+    """Number of words covering each 1 pt bin of [lo, hi)."""
+    n = max(int(np.ceil(hi - lo)), 1)
+    if not words:
+        return np.zeros(n, dtype=int)
+
+    arr = word_arrays(words)
+    starts = np.clip(np.floor(arr["x0"] - lo).astype(int), 0, n)
+    ends = np.clip(np.ceil(arr["x1"] - lo).astype(int), 0, n)
+
+    diff = np.bincount(starts, minlength=n + 1) - np.bincount(ends, minlength=n + 1)
+    return np.cumsum(diff)[:n]
+
+
+def gutter_center(coverage, lo, a, b):
+    """Center of the longest least-covered run of bins between x=a and x=b."""
+    i, j = int(np.floor(a - lo)), int(np.ceil(b - lo))
+    i, j = max(i, 0), min(j, len(coverage))
+    if j <= i:
+        return float((a + b) / 2)
+
+    window = coverage[i:j]
+    low = np.concatenate(([False], window == window.min(), [False]))
+    changes = np.flatnonzero(np.diff(low.astype(int)))
+    run_starts, run_ends = changes[::2], changes[1::2]
+
+    k = np.argmax(run_ends - run_starts)
+    return float(lo + i + (run_starts[k] + run_ends[k]) / 2)
+
+
+def column_edges(rows, labels, header_index):
+    """
+    Infer the columns of the table whose header is rows[header_index].
+
+    Returns (names, edges): column labels left to right and their right
+    boundaries, for layout.column_ids(row, edges). A word whose column
+    id is len(names) lies right of the table (e.g. in the other half of
+    a side-by-side table).
+
+    Each boundary is the emptiest stretch of a histogram of body word
+    extents between two neighbouring header words. Edges are cached per
+    layout signature (header words and their positions), so further
+    pages of the same manual family skip the histogram.
+    """
+    columns, next_header = header_columns(rows[header_index], labels)
+    names = [label for label, _ in columns]
+
+    signature = (
+        tuple((label, round(w["x0"]), round(w["x1"])) for label, w in columns),
+        round(next_header["x0"]) if next_header else None,
+    )
+    if signature in _COLUMN_CACHE:
+        return names, _COLUMN_CACHE[signature]
+
+    # body: rows up to the next header of the same table shape
+    body = []
+    for row in rows[header_index + 1:]:
+        if is_header_row(row, labels):
+            break
+        body.extend(row)
+
+    lo = min([w["x0"] for w in body] + [columns[0][1]["x0"]])
+    hi = max([w["x1"] for w in body] + [columns[-1][1]["x1"]])
+    coverage = coverage_histogram(body, lo, hi)
+
+    edges = [
+        gutter_center(coverage, lo, left["x1"], right["x0"] + HEADER_SLACK)
+        for (_, left), (_, right) in zip(columns, columns[1:])
+    ]
+    if next_header:
+        edges.append(gutter_center(coverage, lo, columns[-1][1]["x1"], next_header["x0"] + HEADER_SLACK))
+    else:
+        edges.append(np.inf)
+
+    if len(_COLUMN_CACHE) >= COLUMN_CACHE_SIZE:
+        _COLUMN_CACHE.clear()
+    _COLUMN_CACHE[signature] = edges
+
+    return names, edges
+
+# ---------------------------------------------------
+# Page regions (side-by-side halves)
+# ---------------------------------------------------
+
+def clear_mask(row, n, min_width=GUTTER_MIN_WIDTH):
+    """1 pt bins of [0, n) at least min_width / 2 away from every word of the row."""
+    half = min_width / 2
+    arr = word_arrays(row)
+    starts = np.clip(np.floor(arr["x0"] - half), 0, n).astype(int)
+    ends = np.clip(np.ceil(arr["x1"] + half), 0, n).astype(int)
+    covered = np.cumsum(np.bincount(starts, minlength=n + 1) - np.bincount(ends, minlength=n + 1))[:n]
+    return covered == 0
+
+
+def gutter_support(row, x, min_span):
+    """
+    For each candidate gutter x: the width of the row's gap around x
+    when the row has min_span of text on both sides, else 0.
+    """
+    arr = word_arrays(row)
+    x0, x1 = arr["x0"][:, None], arr["x1"][:, None]
+
+    left_end = np.where(x1 <= x, x1, -np.inf).max(axis=0)
+    right_start = np.where(x0 >= x, x0, np.inf).min(axis=0)
+
+    ok = (left_end - arr["x0"].min() >= min_span) & (arr["x1"].max() - right_start >= min_span)
+    return np.where(ok, right_start - left_end, 0.0)
+
+
+def claimable_runs(clear, support, free, col):
+    """
+    Runs [start, end) of consecutive free rows that leave column `col`
+    clear and have at least MIN_SPLIT_ROWS rows with words on both sides.
+    """
+    ok = np.concatenate(([False], free & clear[:, col], [False]))
+    changes = np.flatnonzero(np.diff(ok.astype(int)))
+
+    return [
+        (start, end)
+        for start, end in zip(changes[::2], changes[1::2])
+        if support[start:end, col].sum() >= MIN_SPLIT_ROWS
+    ]
+
+
+def row_bands(rows, page_width, min_width=GUTTER_MIN_WIDTH):
+    """
+    Group consecutive rows into bands, each with the gutter its rows
+    leave clear or None (full width). Returns [(gutter, rows)].
+
+    Every column in the middle of the page is scored by the gap widths
+    of the two-sided rows (text on both sides, none within min_width /
+    2) it would split, in bands of consecutive rows that leave it
+    clear; a gutter between halves is wider than the gaps inside them. The best
+    column claims its bands and the rest of the page is scored again.
+    """
+    if not rows:
+        return []
+
+    n = int(np.ceil(page_width)) + 1
+    lo, hi = int(page_width * GUTTER_SEARCH[0]), int(page_width * GUTTER_SEARCH[1])
+    x = np.arange(lo, hi)
+
+    clear = np.array([clear_mask(row, n, min_width)[lo:hi] for row in rows])
+    gaps = np.array([gutter_support(row, x, page_width * MIN_SIDE_SPAN) for row in rows])
+    support = clear & (gaps > 0)
+
+    gutters = [None] * len(rows)
+    free = np.ones(len(rows), dtype=bool)
+
+    while free.any():
+        score = np.array([
+            sum(gaps[start:end, col][support[start:end, col]].sum()
+                for start, end in claimable_runs(clear, support, free, col))
+            for col in range(hi - lo)
+        ])
+        if score.max(initial=0) == 0:
+            break
+
+        # middle of the best plateau closest to the page center
+        best = np.concatenate(([False], score == score.max(), [False]))
+        changes = np.flatnonzero(np.diff(best.astype(int)))
+        mids = (changes[::2] + changes[1::2] - 1) // 2
+        col = int(mids[np.argmin(np.abs(lo + mids - page_width / 2))])
+        gutter = float(lo + col)
+
+        for start, end in claimable_runs(clear, support, free, col):
+            for k in range(start, end):
+                gutters[k] = gutter
+            free[start:end] = False
+
+    bands = []
+    for gutter, row in zip(gutters, rows):
+        if bands and bands[-1][0] == gutter:
+            bands[-1][1].append(row)
+        else:
+            bands.append((gutter, [row]))
+
+    return bands
+
+
+def snap_gutter(gutter, rules, band_top, band_bottom, min_width=GUTTER_MIN_WIDTH):
+    """
+    Move a gutter to the middle of the vertical ruling lines next to it
+    (the facing borders of two side-by-side tables), so cropping at the
+    gutter keeps each table's outer border.
+    """
+    near = [
+        x for x, top, bottom in rules
+        if abs(x - gutter) <= min_width and top < band_bottom and bottom > band_top
+    ]
+    if not near:
+        return gutter
+    return (min(near) + max(near)) / 2
+
+
+def split_regions(words, bbox, min_width=GUTTER_MIN_WIDTH, rules=()):
+    """
+    Split a page into regions in reading order:
+
+        {"column": "full" | "left" | "right", "bbox", "words"}
+
+    Bands of rows that keep clear of a gutter become a left and a right
+    region; everything else (titles, full-width tables, prose) stays
+    full width. Region boxes tile the page, so a cropped region keeps
+    the ruling lines around its rows. `rules` are vertical ruling lines
+    as (x, top, bottom), used to line gutters up with table borders.
+    """
+    x0, top, x1, bottom = bbox
+    bands = row_bands(group_rows(words), x1, min_width)
+
+    if not bands:
+        return [{"column": "full", "bbox": bbox, "words": list(words)}]
+
+    regions = []
+    for k, (gutter, band_rows) in enumerate(bands):
+        band_top = top if k == 0 else (
+            max(w["bottom"] for w in bands[k - 1][1][-1]) + min(w["top"] for w in band_rows[0])
+        ) / 2
+        band_bottom = bottom if k == len(bands) - 1 else (
+            max(w["bottom"] for w in band_rows[-1]) + min(w["top"] for w in bands[k + 1][1][0])
+        ) / 2
+        band_words = [w for row in band_rows for w in row]
+
+        if gutter is None:
+            regions.append({
+                "column": "full",
+                "bbox": (x0, band_top, x1, band_bottom),
+                "words": band_words,
+            })
+            continue
+
+        gutter = snap_gutter(gutter, rules, band_top, band_bottom, min_width)
+
+        regions.append({
+            "column": "left",
+            "bbox": (x0, band_top, gutter, band_bottom),
+            "words": [w for w in band_words if w["x1"] <= gutter],
+        })
+        regions.append({
+            "column": "right",
+            "bbox": (gutter, band_top, x1, band_bottom),
+            "words": [w for w in band_words if w["x0"] >= gutter],
+        })
+
+    return regions
+
+
+def page_regions(page, words=None):
+    """
+    Find the gutters of a pdfplumber page once and return its regions
+    (see split_regions), each with a cropped "page" for table and text
+    extraction.
+    """
+    if words is None:
+        words = page.extract_words(use_text_flow=True)
+
+    rules = [(e["x0"], e["top"], e["bottom"]) for e in page.edges if e["orientation"] == "v"]
+    regions = split_regions(words, tuple(page.bbox), rules=rules)
+    for region in regions:
+        region["page"] = page.crop(region["bbox"])
+
+    return regions
+
+# ---------------------------------------------------
+# Tables by region
+# ---------------------------------------------------
+
+def table_column_x0(table):
+    """
+    Left edge of every column of a pdfplumber Table, from its cell
+    boxes. Table.columns gives spanned or empty columns a None bbox;
+    this keeps one slot per column of table.extract().
+    """
+    return sorted({cell[0] for cell in table.cells})
+
+
+def split_table_by_gutter(table, regions, min_width=GUTTER_MIN_WIDTH):
+    """
+    Column indexes of a table per side of the gutter it straddles, as
+    [left, right], or [all columns] when it sits in one region.
+    """
+    x0s = table_column_x0(table)
+    columns = list(range(len(x0s)))
+    _, top, _, bottom = table.bbox
+
+    def overlap(region):
+        _, r_top, _, r_bottom = region["bbox"]
+        return min(bottom, r_bottom) - max(top, r_top)
+
+    halves = [r for r in regions if r["column"] != "full" and overlap(r) > 0]
+    if not halves:
+        return [columns]
+
+    # The band covering most of the table decides the gutter, which
+    # must fall on a column boundary of the grid to split it
+    best = max(halves, key=overlap)
+    gutter = best["bbox"][2] if best["column"] == "left" else best["bbox"][0]
+
+    boundaries = [i for i in columns[1:] if abs(x0s[i] - gutter) <= min_width]
+    if not boundaries:
+        return [columns]
+    split = min(boundaries, key=lambda i: abs(x0s[i] - gutter))
+    return [columns[:split], columns[split:]]
+
+
+def region_tables(page, regions=None):
+    """
+    Table matrices of a pdfplumber page, cut along its layout regions.
+    Tables are found once on the whole page, so none loses ruling lines
+    to a crop; a table straddling a gutter (two parts lists drawn as one
+    grid) becomes one matrix per side, left before right.
+    """
+    if regions is None:
+        regions = page_regions(page)
+
+    matrices = []
+    for table in page.find_tables():
+        rows = table.extract()
+        for columns in split_table_by_gutter(table, regions):
+            matrices.append([[row[i] for i in columns] for row in rows])
+
+    return matrices
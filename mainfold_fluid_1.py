@@ -53,7 +53,8 @@ def extract_manifold_json_from_dfs(dfs):
 
             current_item = None
 
-            for _, row in table.iterrows():
+            # positional access: header cells make the column labels strings
+            for row in table.itertuples(index=False, name=None):
                 item_raw = str(row[0]).strip()
 
                 # detect new item row
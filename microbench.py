@@ -0,0 +1,306 @@
+import argparse
+import contextlib
+import copy
+import io
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+FIXTURE_DIR = Path("fixtures/parsers")
+OUTPUT_DIR = Path("output/benchmarks")
+
+# Rounds per parser: keep going until MAX_TIME seconds or MAX_ROUNDS,
+# but never fewer than MIN_ROUNDS
+MIN_ROUNDS = 5
+MAX_ROUNDS = 10000
+MAX_TIME = 1.0
+
+# ---------------------------------------------------
+# Parser inputs (built from the fixture matrices, outside the timing)
+# ---------------------------------------------------
+
+def na_frame(table):
+    """table_count__.extract_all_tables: raw cells, "" as NA, empty rows dropped."""
+    return pd.DataFrame(table).replace("", pd.NA).dropna(how="all")
+
+
+def clean_na_frame(table):
+    """diaphrgm_4.extract_diaphragm_table."""
+    import diaphrgm_4
+
+    df = pd.DataFrame([[diaphrgm_4.clean(c) for c in row] for row in table])
+    return df.replace("", pd.NA).dropna(how="all").reset_index(drop=True)
+
+
+def clean_text_frame(table):
+    """check.extract_page_tables_as_json."""
+    import check
+
+    return pd.DataFrame([[check.clean_text(c) for c in row] for row in table])
+
+
+def pipeline_frame(tables, kind):
+    """table_count_111.parse_all_tables: DataFrames of one type, concatenated."""
+    import table_count_111
+
+    dfs = [
+        df for df in table_count_111.tables_to_dataframes(tables)
+        if table_count_111.classify_table(df) == kind
+    ]
+    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+
+# ---------------------------------------------------
+# Parsers under test: (args builder, call)
+# ---------------------------------------------------
+
+def bench_extract_option_entries():
+    import table_count__
+
+    return (
+        lambda tables: [na_frame(t) for t in tables],
+        lambda dfs: [table_count__.extract_option_entries(df) for df in dfs],
+    )
+
+
+def bench_parse_common_parts():
+    import table_count__
+
+    return (
+        lambda tables: [na_frame(t) for t in tables],
+        lambda dfs: [table_count__.parse_common_parts(df) for df in dfs],
+    )
+
+
+def bench_common_parts_new_22():
+    import common_parts_new_22
+
+    return (
+        copy.deepcopy,
+        lambda tables: [common_parts_new_22.extract_common_parts(t) for t in tables],
+    )
+
+
+def bench_mainfold_fluid_1():
+    import mainfold_fluid_1
+
+    return (
+        lambda tables: pipeline_frame(tables, "mainfold"),
+        mainfold_fluid_1.extract_manifold_json_from_dfs,
+    )
+
+
+def bench_diaphrgm_4():
+    import diaphrgm_4
+
+    return (
+        lambda tables: [clean_na_frame(t) for t in tables],
+        lambda dfs: [diaphrgm_4.parse_diaphragm_df(df) for df in dfs],
+    )
+
+
+def bench_seat_options():
+    import seat_options
+
+    return (
+        copy.deepcopy,
+        lambda tables: [seat_options.parse_seat_table(t) for t in tables],
+    )
+
+
+def bench_air_section_2():
+    import air_section_2
+
+    return (
+        copy.deepcopy,
+        lambda tables: [air_section_2.table_to_records(t) for t in tables],
+    )
+
+
+def bench_check():
+    import check
+
+    return (
+        lambda tables: [clean_text_frame(t) for t in tables],
+        lambda dfs: [check.convert_wide_table_to_json(df) for df in dfs],
+    )
+
+# ---------------------------------------------------
+# Fixture capture (the only place PDFs are opened)
+# ---------------------------------------------------
+
+def page_tables(page):
+    return page.extract_tables()
+
+
+def region_tables(page):
+    import layout
+
+    return layout.region_tables(page)
+
+
+def air_section_tables(page):
+    import air_section_2
+
+    return air_section_2.page_tables(page)
+
+
+def table_text(table):
+    return " ".join(str(c) for row in table for c in row if c).upper()
+
+
+def containing(*words):
+    return lambda table: any(w in table_text(table) for w in words)
+
+
+def keep_all(table):
+    return True
+
+
+# name -> (bench factory, pdf, page, table finder, table filter)
+CASES = {
+    "table_count__.extract_option_entries": (
+        bench_extract_option_entries, "PX05P.pdf", 5, page_tables, containing("SEAT OPTIONS", "BALL OPTIONS")),
+    "table_count__.parse_common_parts": (
+        bench_parse_common_parts, "PX05P.pdf", 5, page_tables, containing("COMMON PARTS")),
+    "common_parts_new_22.extract_common_parts": (
+        bench_common_parts_new_22, "PX05P.pdf", 5, region_tables, keep_all),
+    "mainfold_fluid_1.extract_manifold_json_from_dfs": (
+        bench_mainfold_fluid_1, "PX05P.pdf", 5, page_tables, keep_all),
+    "diaphrgm_4.parse_diaphragm_df": (
+        bench_diaphrgm_4, "PX20X.pdf", 5, page_tables, containing("DIAPHRAGM OPTIONS")),
+    "seat_options.parse_seat_table": (
+        bench_seat_options, "PX03P.pdf", 5, page_tables, containing("SEAT OPTIONS")),
+    "air_section_2.table_to_records": (
+        bench_air_section_2, "PX20P.pdf", 8, air_section_tables, keep_all),
+    "check.convert_wide_table_to_json": (
+        bench_check, "PX03P.pdf", 5, page_tables, keep_all),
+}
+
+
+def fixture_path(name):
+    return FIXTURE_DIR / f"{name}.json"
+
+
+def capture_fixtures(names=None):
+    """Extract each case's cell matrices from its manual page and save them."""
+    import pdfplumber
+
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+
+    for name in names or CASES:
+        _, pdf_file, page_no, find_tables, keep = CASES[name]
+
+        with pdfplumber.open(pdf_file) as pdf:
+            tables = [t for t in find_tables(pdf.pages[page_no - 1]) if keep(t)]
+
+        fixture = {"pdf": pdf_file, "page": page_no, "tables": tables}
+        fixture_path(name).write_text(json.dumps(fixture, indent=1, ensure_ascii=False), encoding="utf-8")
+        print(f"{name}: {len(tables)} tables from {pdf_file} p{page_no}")
+
+
+def load_fixture(name):
+    with open(fixture_path(name), encoding="utf-8") as f:
+        return json.load(f)["tables"]
+
+# ---------------------------------------------------
+# Timing (pytest-benchmark "pedantic" style: setup per round, untimed)
+# ---------------------------------------------------
+
+def benchmark(func, setup, min_rounds=MIN_ROUNDS, max_rounds=MAX_ROUNDS, max_time=MAX_TIME):
+    times = []
+    started = time.perf_counter()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        while len(times) < max_rounds:
+            arg = setup()
+
+            t0 = time.perf_counter_ns()
+            func(arg)
+            times.append((time.perf_counter_ns() - t0) / 1e9)
+
+            if len(times) >= min_rounds and time.perf_counter() - started >= max_time:
+                break
+
+    quartiles = statistics.quantiles(times, n=4) if len(times) > 1 else [times[0]] * 3
+    mean = statistics.fmean(times)
+
+    return {
+        "rounds": len(times),
+        "min": min(times),
+        "max": max(times),
+        "mean": mean,
+        "stddev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "median": statistics.median(times),
+        "iqr": quartiles[2] - quartiles[0],
+        "ops": 1 / mean if mean else None,
+    }
+
+
+def run_benchmarks(names=None, max_time=MAX_TIME):
+    results = {}
+
+    for name in names or CASES:
+        factory = CASES[name][0]
+        build, call = factory()
+        tables = load_fixture(name)
+
+        results[name] = benchmark(call, lambda: build(tables), max_time=max_time)
+        results[name]["tables"] = len(tables)
+
+    return results
+
+
+def format_results(results, baseline=None):
+    lines = [f"{'parser':<56} {'min us':>10} {'median us':>10} {'stddev':>9} {'rounds':>7}"
+             + ("  vs baseline" if baseline else "")]
+
+    for name, r in sorted(results.items(), key=lambda kv: kv[1]["median"]):
+        line = (f"{name:<56} {r['min'] * 1e6:>10.1f} {r['median'] * 1e6:>10.1f} "
+                f"{r['stddev'] * 1e6:>9.1f} {r['rounds']:>7}")
+        base = (baseline or {}).get(name)
+        if base:
+            line += f"  {(r['median'] / base['median'] - 1) * 100:+.1f}%"
+        lines.append(line)
+
+    return "\n".join(lines)
+
+# ---------------------------------------------------
+# RUN
+# ---------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time each section parser on serialized table fixtures.")
+    parser.add_argument("names", nargs="*", help="parsers to run (default: all); substrings match")
+    parser.add_argument("--capture", action="store_true", help="re-extract the fixtures from the bundled PDFs")
+    parser.add_argument("--max-time", type=float, default=MAX_TIME, help="seconds per parser")
+    parser.add_argument("--save", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON from an earlier --save to diff medians against")
+    args = parser.parse_args()
+
+    names = [n for n in CASES if not args.names or any(a in n for a in args.names)]
+    if not names:
+        sys.exit(f"no parser matches {args.names}")
+
+    if args.capture:
+        capture_fixtures(names)
+
+    results = run_benchmarks(names, args.max_time)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(format_results(results, baseline))
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(results, indent=2), encoding="utf-8")
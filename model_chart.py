@@ -0,0 +1,239 @@
+import json
+import re
+import sys
+from pathlib import Path
+
+import pdfplumber
+import pypdfium2 as pdfium
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+CHART_TITLE = "MODEL DESCRIPTION CHART"
+
+# Lines that close the chart in the different manual layouts
+END_MARKERS = (
+    "special testing",
+    "notice: all possible options",
+    "fluid section service kit selection",
+)
+
+# ---------------------------------------------------
+# Section matcher
+#
+# Union of the riad / model_description SECTION_MAP keys and the
+# model_description11 SECTION_SYNONYMS, keyed by normalize(header) so
+# one dict lookup resolves a header line for PX / PD / PE / 666 charts.
+#
+# All three write the canonical names below (the MODEL_CODE_FIELDS
+# names). Older charts used "Seat Material", "Ball Material" and
+# "Diaphragm Material"; chart_codes.load_chart maps those, so readers
+# accept chart JSON from before and after the rename.
+# ---------------------------------------------------
+
+SECTION_SYNONYMS = {
+    "Model Series": ["model series"],
+    "Center Body Material": [
+        "center body material",
+        "air motor air cap material",
+    ],
+    "Connection": ["connection", "fluid connection"],
+    "Fluid Caps / Manifold Material": [
+        "fluid cap manifold material",
+        "fluid caps manifold material",
+        "fluid cap and manifold material",
+        "fluid caps and manifold material",
+    ],
+    "Hardware Material": ["hardware material"],
+    "Seat / Spacer Material": ["seat material", "seat spacer material"],
+    "Check Material": ["check material", "ball material"],
+    "Diaphragm / O-Ring Material": [
+        "diaphragm material",
+        "diaphragm oring material",
+        "diaphragm o ring material",
+    ],
+    "Revision": ["revision"],
+    "Specialty Code 1": ["specialty code 1"],
+    "Specialty Code 2": ["specialty code 2"],
+}
+
+VALID_SECTIONS = list(SECTION_SYNONYMS)
+
+SECTION_MATCHER = {
+    variant: canonical
+    for canonical, variants in SECTION_SYNONYMS.items()
+    for variant in variants
+}
+
+CODE_DESC_REGEX = re.compile(r"^\s*([A-Z0-9]{1,5})\s*[-–]\s*(.+)$")
+
+# ---------------------------------------------------
+# Text helpers
+# ---------------------------------------------------
+
+def clean_line(text):
+    if not text:
+        return ""
+    text = re.sub(r"\(\(cid:\d+\)\)", "", text)
+    text = re.sub(r"\(cid:\d+\)", "", text)
+    text = text.replace("“", '"').replace("”", '"')
+    text = text.replace("–", "-").replace("®", "")
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def normalize(text):
+    text = text.lower()
+    text = re.sub(r"\(.*?\)", "", text)
+    text = text.replace("&", " and ")
+    text = re.sub(r"[^a-z0-9 ]", "", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def detect_section(line):
+    return SECTION_MATCHER.get(normalize(line))
+
+
+def is_end_marker(line):
+    return line.lower().startswith(END_MARKERS)
+
+
+def is_chart_title(line):
+    return line.strip().upper().startswith(CHART_TITLE)
+
+# ---------------------------------------------------
+# Chart locator
+# ---------------------------------------------------
+
+def locate_chart_pages(pdf_path):
+    """
+    Return the 1-based page numbers holding the model description
+    chart. Pages are probed with pdfium's plain text dump (no layout
+    analysis) and probing stops as soon as the chart's end marker is
+    seen, so for most manuals only the first two pages are touched.
+    """
+    pages = []
+    pdf = pdfium.PdfDocument(str(pdf_path))
+
+    try:
+        for i in range(len(pdf)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            text = textpage.get_text_range()
+            textpage.close()
+            page.close()
+
+            if not pages and not any(is_chart_title(l) for l in text.splitlines()):
+                continue
+
+            pages.append(i + 1)
+
+            lower = text.lower()
+            if any(marker in lower for marker in END_MARKERS):
+                break
+    finally:
+        pdf.close()
+
+    return pages
+
+# ---------------------------------------------------
+# Chart parsing
+# ---------------------------------------------------
+
+def iter_chart_lines(pdf_path, page_numbers=None):
+    """
+    Yield cleaned lines from the chart title up to the end marker,
+    parsing only the located chart pages.
+    """
+    if page_numbers is None:
+        page_numbers = locate_chart_pages(pdf_path)
+    elif isinstance(page_numbers, int):
+        page_numbers = [page_numbers]
+
+    if not page_numbers:
+        return
+
+    started = False
+
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_no in page_numbers:
+            if page_no < 1 or page_no > len(pdf.pages):
+                continue
+
+            text = pdf.pages[page_no - 1].extract_text()
+            if not text:
+                continue
+
+            for raw_line in text.splitlines():
+                line = clean_line(raw_line)
+                if not line:
+                    continue
+
+                if not started:
+                    started = is_chart_title(line)
+                    continue
+
+                if is_end_marker(line):
+                    return
+
+                yield line
+
+
+def default_entry_filter(section, code, desc):
+    desc_lower = desc.lower()
+    bad_words = ["page", "xxx-xxx", "air section", "fluid section", "special testing"]
+    return not any(bad in desc_lower for bad in bad_words)
+
+
+def extract_model_description_chart(pdf_path, page_numbers=None, is_valid_entry=None):
+    """
+    Return {section: [{"code", "description"}]} for the chart in
+    `pdf_path`. `is_valid_entry(section, code, desc)` lets the calling
+    extractor keep its own noise rules.
+    """
+    is_valid_entry = is_valid_entry or default_entry_filter
+
+    chart = {s: [] for s in VALID_SECTIONS}
+    seen = {s: set() for s in VALID_SECTIONS}
+    current_section = None
+
+    for line in iter_chart_lines(pdf_path, page_numbers):
+        section = detect_section(line)
+        if section:
+            current_section = section
+            continue
+
+        if not current_section:
+            continue
+
+        match = CODE_DESC_REGEX.match(line)
+        if not match:
+            continue
+
+        code, desc = match.groups()
+        code, desc = code.strip(), desc.strip()
+
+        if not code or not desc or not is_valid_entry(current_section, code, desc):
+            continue
+
+        if code in seen[current_section]:
+            continue
+
+        chart[current_section].append({"code": code, "description": desc})
+        seen[current_section].add(code)
+
+    return {k: v for k, v in chart.items() if v}
+
+# ---------------------------------------------------
+# RUN
+# ---------------------------------------------------
+
+if __name__ == "__main__":
+    pdf_file = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("PX03P.pdf")
+
+    if not pdf_file.exists():
+        print(f"❌ PDF file not found: {pdf_file}")
+    else:
+        print(f"Chart pages: {locate_chart_pages(pdf_file)}")
+        print(json.dumps(extract_model_description_chart(pdf_file), indent=2))
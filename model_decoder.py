@@ -0,0 +1,113 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Layout, aliases and chart loading live in chart_codes (no pandas)
+from chart_codes import CHART_SECTION_ALIASES, CODE_SEPARATORS, MODEL_CODE_FIELDS, load_chart
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+CHART_FILE = Path("model_description_chart.json")
+ORDERS_FILE = Path("orders.csv")
+OUTPUT_FILE = Path("output/decoded_orders.csv")
+
+# ---------------------------------------------------
+# Vectorized decoding
+# ---------------------------------------------------
+
+def _lookup_descriptions(codes, section_lookup):
+    """
+    Categorical join of one code column against a chart section.
+    Unknown codes get category -1, which indexes the trailing ""
+    so no Python-level loop is needed.
+    """
+    categories = list(section_lookup)
+    descriptions = np.array(list(section_lookup.values()) + [""], dtype=object)
+
+    cat = pd.Categorical(codes, categories=categories)
+    return descriptions[cat.codes], cat.codes >= 0
+
+
+def decode_model_codes(model_codes, chart):
+    """
+    Decode a column of model code strings against the model
+    description chart. Returns one row per input code with a code and
+    description column per chart section plus a "valid" flag.
+    """
+    lookup = load_chart(chart)
+
+    model_codes = pd.Series(model_codes, dtype="string").fillna("")
+
+    # ERP exports repeat the same model code many times, decode each
+    # distinct code once and broadcast back to the rows
+    row_index, uniques = pd.factorize(model_codes, sort=False)
+    uniques = pd.Series(uniques, dtype="string")
+
+    compact = (
+        uniques.str.upper()
+        .str.replace(CODE_SEPARATORS, "", regex=True)
+    )
+
+    decoded = {"model_code": uniques.to_numpy(dtype=object)}
+
+    # Truncated codes or trailing characters shift every field, so only
+    # full-length codes can be valid
+    code_length = sum(width for _, width in MODEL_CODE_FIELDS)
+    valid = (compact.str.len() == code_length).to_numpy(dtype=bool)
+
+    start = 0
+    for section, width in MODEL_CODE_FIELDS:
+        codes = compact.str.slice(start, start + width).to_numpy(dtype=object)
+        start += width
+
+        # "0" in a specialty position ("-A00") means no specialty code
+        if section.startswith("Specialty Code"):
+            codes[codes == "0" * width] = ""
+
+        section_lookup = lookup.get(section, {})
+        descriptions, found = _lookup_descriptions(codes, section_lookup)
+
+        # Blank specialty codes are allowed, everything else must be known
+        if section.startswith("Specialty Code"):
+            found |= codes == ""
+        if section_lookup:
+            valid &= found
+
+        decoded[section] = codes
+        decoded[f"{section} Description"] = descriptions
+
+    decoded["valid"] = valid
+
+    table = pd.DataFrame(decoded)
+    return table.take(row_index).reset_index(drop=True)
+
+
+def decode_order_file(orders_path, chart, column="model_code", output_path=None):
+    """Decode the model code column of an ERP order export (CSV)."""
+    orders = pd.read_csv(orders_path, usecols=[column], dtype={column: "string"})
+    decoded = decode_model_codes(orders[column], chart)
+
+    if output_path:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(exist_ok=True)
+        decoded.to_csv(output_path, index=False)
+
+    return decoded
+
+# ---------------------------------------------------
+# RUN
+# ---------------------------------------------------
+
+if __name__ == "__main__":
+    orders_file = Path(sys.argv[1]) if len(sys.argv) > 1 else ORDERS_FILE
+
+    if not orders_file.exists():
+        print(f"❌ Order file not found: {orders_file}")
+    else:
+        result = decode_order_file(orders_file, CHART_FILE, output_path=OUTPUT_FILE)
+        print(f"✅ Decoded {len(result)} order lines ({int(result['valid'].sum())} valid)")
+        print(f"📄 Saved to {OUTPUT_FILE}")
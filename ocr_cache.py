@@ -0,0 +1,95 @@
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+CACHE_DIR = Path(os.environ.get("OCR_CACHE_DIR", "output/ocr_cache"))
+SIZE_LIMIT = int(os.environ.get("OCR_CACHE_SIZE_MB", "512")) * 1024 * 1024
+ENABLED = os.environ.get("OCR_CACHE", "1") != "0"
+
+# ---------------------------------------------------
+# Cache store
+# ---------------------------------------------------
+
+_CACHE = None
+
+
+def get_cache():
+    """Disk cache shared by every process on the machine, LRU-evicted at SIZE_LIMIT."""
+    global _CACHE
+
+    if _CACHE is None:
+        import diskcache
+
+        CACHE_DIR.parent.mkdir(parents=True, exist_ok=True)
+        _CACHE = diskcache.Cache(
+            str(CACHE_DIR),
+            size_limit=SIZE_LIMIT,
+            eviction_policy="least-recently-used",
+        )
+
+    return _CACHE
+
+# ---------------------------------------------------
+# Keys
+# ---------------------------------------------------
+
+def image_digest(image):
+    """
+    Content hash of a raster: numpy array (pixels + shape + dtype),
+    raw bytes, or an image file path (file bytes).
+    """
+    h = hashlib.sha256()
+
+    if isinstance(image, (str, Path)):
+        with open(image, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    elif isinstance(image, (bytes, bytearray, memoryview)):
+        h.update(image)
+    else:
+        arr = np.ascontiguousarray(np.asarray(image))
+        h.update(repr((arr.shape, str(arr.dtype))).encode("utf-8"))
+        h.update(arr.data)
+
+    return h.hexdigest()
+
+
+def ocr_key(image, engine, version, languages, **settings):
+    settings_repr = repr((engine, str(version), tuple(languages), sorted(settings.items())))
+    return f"{image_digest(image)}:{hashlib.sha256(settings_repr.encode('utf-8')).hexdigest()[:16]}"
+
+# ---------------------------------------------------
+# Cached OCR
+# ---------------------------------------------------
+
+def get_cached(key):
+    return get_cache().get(key) if ENABLED else None
+
+
+def put_cached(key, result):
+    if ENABLED:
+        get_cache().set(key, result)
+
+
+def cached_ocr(image, engine, version, languages, compute, **settings):
+    """
+    Return the cached OCR result for this raster and engine settings,
+    or run compute() and store its result.
+    """
+    if not ENABLED:
+        return compute()
+
+    key = ocr_key(image, engine, version, languages, **settings)
+
+    result = get_cached(key)
+    if result is None:
+        result = compute()
+        put_cached(key, result)
+
+    return result
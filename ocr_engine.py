@@ -0,0 +1,122 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from importlib.metadata import version
+
+import ocr_cache
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+DEFAULT_LANGUAGES = ("en",)
+DEFAULT_GPU = False
+
+# ---------------------------------------------------
+# Process-wide reader cache
+#
+# easyocr.Reader loads the detection and recognition models from disk
+# (several seconds), so each process builds it once and reuses it for
+# every page and PDF it sees.
+# ---------------------------------------------------
+
+_READERS = {}
+
+
+def get_reader(languages=DEFAULT_LANGUAGES, gpu=DEFAULT_GPU):
+    key = (tuple(languages), bool(gpu))
+    reader = _READERS.get(key)
+
+    if reader is None:
+        import easyocr
+
+        reader = easyocr.Reader(list(languages), gpu=gpu)
+        _READERS[key] = reader
+
+    return reader
+
+
+@lru_cache(maxsize=None)
+def engine_version():
+    return version("easyocr")
+
+
+def readtext(image, languages=DEFAULT_LANGUAGES, gpu=DEFAULT_GPU, **kwargs):
+    """
+    OCR one image (path, bytes or numpy array) with the cached reader.
+    Results are memoized on disk by image content + engine settings,
+    so identical crops are never recognized twice.
+    """
+    def compute():
+        return get_reader(languages, gpu).readtext(image, **kwargs)
+
+    return ocr_cache.cached_ocr(
+        image, "easyocr", engine_version(), languages, compute, **kwargs
+    )
+
+# ---------------------------------------------------
+# Worker pool
+# ---------------------------------------------------
+
+_WORKER_SETTINGS = {}
+
+
+def _init_worker(languages, gpu, threads):
+    # Keep torch from spawning one thread per core in every worker
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    _WORKER_SETTINGS.update(languages=languages, gpu=gpu)
+    get_reader(languages, gpu)
+
+
+def _worker_readtext(job):
+    image, kwargs = job
+    return readtext(
+        image,
+        _WORKER_SETTINGS["languages"],
+        _WORKER_SETTINGS["gpu"],
+        **kwargs,
+    )
+
+
+class OcrPool:
+    """
+    Pool of worker processes, each holding one warmed-up reader.
+
+        with OcrPool(workers=4) as pool:
+            for result in pool.map(page_images):
+                ...
+
+    Jobs are queued to the workers as they free up, so scanned
+    manuals can be fed in page by page.
+    """
+
+    def __init__(self, workers=None, languages=DEFAULT_LANGUAGES, gpu=DEFAULT_GPU,
+                 threads_per_worker=1):
+        self.workers = workers or max(1, (os.cpu_count() or 2) // 2)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(tuple(languages), gpu, threads_per_worker),
+        )
+
+    def submit(self, image, **kwargs):
+        return self._executor.submit(_worker_readtext, (image, kwargs))
+
+    def map(self, images, **kwargs):
+        """OCR images in order, yielding one readtext() result per image."""
+        return self._executor.map(_worker_readtext, ((img, kwargs) for img in images))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
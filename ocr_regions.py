@@ -0,0 +1,209 @@
+import re
+
+import pdfplumber
+import pypdfium2 as pdfium
+
+import layout
+import ocr_engine
+import ocr_table
+import page_raster
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+# Headers of the tables the section parsers care about
+REGION_HEADERS = re.compile(r"COMMON\s+PARTS|OPTIONS", re.IGNORECASE)
+
+# Breathing room around a region so edge glyphs are not clipped
+PAD = 4
+
+# Height (points) of the strip above a table searched for its title
+TITLE_BAND = 24
+
+# ---------------------------------------------------
+# Region detection
+# ---------------------------------------------------
+
+def pad_bbox(bbox, page_width, page_height, pad=PAD):
+    x0, top, x1, bottom = bbox
+    return (
+        max(0, x0 - pad),
+        max(0, top - pad),
+        min(page_width, x1 + pad),
+        min(page_height, bottom + pad),
+    )
+
+
+def table_regions(page):
+    """Table boxes from the vector layer (ruling lines), if any."""
+    return [t.bbox for t in page.find_tables()]
+
+
+def detect_header_regions(page, pdfium_page, headers=REGION_HEADERS,
+                          dpi=page_raster.DETECT_DPI):
+    """
+    Low-DPI pass for pages without a vector layer: OCR the page at
+    `dpi`, find the table headers and return one band per header,
+    running down to the next header or the page bottom.
+    """
+    image = page_raster.render_region(pdfium_page, None, dpi)
+    scale = dpi / 72
+
+    tops = sorted(
+        box[0][1] / scale
+        for box, text, conf in ocr_engine.readtext(image)
+        if headers.search(text)
+    )
+
+    regions = []
+    for i, top in enumerate(tops):
+        bottom = tops[i + 1] if i + 1 < len(tops) else page.height
+        regions.append((0, top, page.width, bottom))
+
+    return regions
+
+
+def find_ocr_regions(page, pdfium_page):
+    regions = table_regions(page) or detect_header_regions(page, pdfium_page)
+    return [pad_bbox(r, page.width, page.height) for r in regions]
+
+# ---------------------------------------------------
+# Region OCR
+# ---------------------------------------------------
+
+def ocr_region(pdfium_page, bbox, dpi=page_raster.OCR_DPI):
+    """
+    OCR one region at `dpi`. Boxes are mapped back to page
+    coordinates (points) so results from different crops line up.
+    """
+    image = page_raster.render_region(pdfium_page, bbox, dpi)
+    scale = dpi / 72
+    x0, top = bbox[0], bbox[1]
+
+    results = []
+    for box, text, conf in ocr_engine.readtext(image):
+        box = [(x0 + x / scale, top + y / scale) for x, y in box]
+        results.append((box, text, conf))
+
+    return results
+
+
+def ocr_page_regions(page, pdfium_page):
+    """Yield (bbox, ocr_results) for every table region of one page."""
+    for bbox in find_ocr_regions(page, pdfium_page):
+        yield bbox, ocr_region(pdfium_page, bbox)
+
+
+def results_to_words(ocr_results):
+    """
+    Convert readtext() results to pdfplumber extract_words() style
+    dicts (plus "conf") so word-based parsers can take either source.
+    """
+    words = []
+    for box, text, conf in ocr_results:
+        xs = [x for x, _ in box]
+        ys = [y for _, y in box]
+        words.append({
+            "text": text,
+            "x0": min(xs),
+            "x1": max(xs),
+            "top": min(ys),
+            "bottom": max(ys),
+            "conf": conf,
+        })
+    return words
+
+
+def find_ocr_tables(page, pdfium_page):
+    """
+    Return (bbox, column_edges) per table region. Vector tables carry
+    their ruled column grid, header bands get edges inferred later.
+    """
+    tables = page.find_tables()
+
+    if not tables:
+        return [
+            (pad_bbox(r, page.width, page.height), None)
+            for r in detect_header_regions(page, pdfium_page)
+        ]
+
+    regions = []
+    for t in tables:
+        edges = layout.table_column_x0(t)
+        regions.append((pad_bbox(t.bbox, page.width, page.height), edges or None))
+    return regions
+
+
+def page_tables_ocr(page, pdfium_page, drop_low_conf=False):
+    """Yield (bbox, matrix) for every table region of one page."""
+    for bbox, edges in find_ocr_tables(page, pdfium_page):
+        words = results_to_words(ocr_region(pdfium_page, bbox))
+        matrix, _ = ocr_table.build_table(words, edges, drop_low_conf=drop_low_conf)
+        if matrix:
+            yield bbox, matrix
+
+
+def extract_tables_ocr(page, pdfium_page, drop_low_conf=False):
+    """
+    OCR counterpart of page.extract_tables(): one cell matrix per
+    table region, so the section parsers run unchanged on scans.
+    """
+    return [matrix for _, matrix in page_tables_ocr(page, pdfium_page, drop_low_conf)]
+
+
+def region_title(pdfium_page, bbox, height=TITLE_BAND):
+    """
+    OCR text of the strip just above a region. Section titles often
+    sit there rather than inside the ruled table.
+    """
+    x0, top, x1, _ = bbox
+    if top <= 0:
+        return ""
+    band = (x0, max(0, top - height), x1, top)
+    return " ".join(text for _, text, _ in ocr_region(pdfium_page, band))
+
+
+def iter_pdf_pages(pdf_path, page_numbers=None):
+    """
+    Yield (page_number, page, pdfium_page) for the requested pages
+    (1-based, default all), closing each page after use.
+    """
+    pdfium_doc = pdfium.PdfDocument(str(pdf_path))
+
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            if page_numbers is None:
+                page_numbers = range(1, len(pdf.pages) + 1)
+
+            for page_no in page_numbers:
+                page = pdf.pages[page_no - 1]
+                pdfium_page = pdfium_doc[page_no - 1]
+
+                try:
+                    yield page_no, page, pdfium_page
+                finally:
+                    pdfium_page.close()
+                    page.close()
+    finally:
+        pdfium_doc.close()
+
+
+def ocr_pdf_regions(pdf_path, page_numbers=None):
+    """
+    Yield (page_number, bbox, ocr_results) for every table region of
+    the requested pages (1-based, default all).
+    """
+    for page_no, page, pdfium_page in iter_pdf_pages(pdf_path, page_numbers):
+        for bbox, results in ocr_page_regions(page, pdfium_page):
+            yield page_no, bbox, results
+
+
+def ocr_pdf_tables(pdf_path, page_numbers=None, drop_low_conf=False):
+    """
+    Yield (page_number, title, matrix) for every table region of the
+    requested pages, where title is the OCR text just above the region.
+    """
+    for page_no, page, pdfium_page in iter_pdf_pages(pdf_path, page_numbers):
+        for bbox, matrix in page_tables_ocr(page, pdfium_page, drop_low_conf):
+            yield page_no, region_title(pdfium_page, bbox), matrix
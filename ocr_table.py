@@ -0,0 +1,101 @@
+import layout
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+# Tokens below this recognition confidence are flagged (or dropped)
+MIN_CONF = 0.4
+
+# Tokens whose vertical centers are within this fraction of the median
+# token height belong to the same row
+ROW_TOLERANCE = 0.5
+
+# x-starts closer than this (points) are the same column candidate
+COLUMN_GAP = 8
+
+# A column candidate must start a token in this share of rows
+COLUMN_SUPPORT = 0.3
+
+# ---------------------------------------------------
+# Rows
+# ---------------------------------------------------
+
+def cluster_rows(words, tolerance=ROW_TOLERANCE):
+    """Group tokens into rows by vertical center, left to right within a row."""
+    if not words:
+        return []
+
+    heights = sorted(w["bottom"] - w["top"] for w in words)
+    max_gap = tolerance * (heights[len(heights) // 2] or 1)
+
+    return layout.group_rows(words, max_gap)
+
+# ---------------------------------------------------
+# Columns
+# ---------------------------------------------------
+
+def infer_column_edges(rows, gap=COLUMN_GAP, support=COLUMN_SUPPORT):
+    """
+    Column left edges from x-starts that recur across rows. Used when
+    the region has no vector table grid to snap to.
+    """
+    starts = sorted((w["x0"], i) for i, row in enumerate(rows) for w in row)
+    if not starts:
+        return []
+
+    clusters = [[starts[0]]]
+    for x, i in starts[1:]:
+        if x - clusters[-1][-1][0] > gap:
+            clusters.append([])
+        clusters[-1].append((x, i))
+
+    min_rows = max(2, support * len(rows))
+    edges = [
+        c[0][0] for c in clusters
+        if len({i for _, i in c}) >= min_rows
+    ]
+
+    return edges or [starts[0][0]]
+
+# ---------------------------------------------------
+# Table matrix
+# ---------------------------------------------------
+
+def build_table(words, column_edges=None, min_conf=MIN_CONF, drop_low_conf=False):
+    """
+    Rebuild a table matrix from OCR tokens (results_to_words dicts).
+
+    Returns (matrix, flagged) where matrix has the same shape as a
+    pdfplumber extract_tables() table (list of rows of cell strings)
+    and flagged lists {"row", "col", "text", "conf"} for tokens under
+    min_conf. With drop_low_conf those tokens are left out of the
+    matrix instead of only being flagged.
+    """
+    rows = cluster_rows(words)
+    if not rows:
+        return [], []
+
+    edges = sorted(column_edges) if column_edges else infer_column_edges(rows)
+
+    matrix = []
+    flagged = []
+
+    for r, row in enumerate(rows):
+        cells = [[] for _ in edges]
+
+        cols = layout.column_ids(row, edges, anchor="center") - 1
+
+        for w, col in zip(row, cols.clip(min=0).tolist()):
+            conf = w.get("conf", 1.0)
+
+            if conf < min_conf:
+                flagged.append({"row": r, "col": col, "text": w["text"], "conf": conf})
+                if drop_low_conf:
+                    continue
+
+            cells[col].append(w["text"])
+
+        matrix.append([" ".join(c) for c in cells])
+
+    return matrix, flagged
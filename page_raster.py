@@ -0,0 +1,65 @@
+import pypdfium2 as pdfium
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+OCR_DPI = 300
+DETECT_DPI = 50
+
+# ---------------------------------------------------
+# Rendering
+# ---------------------------------------------------
+
+def render_region(pdfium_page, bbox=None, dpi=OCR_DPI):
+    """
+    Render a (x0, top, x1, bottom) region of a page, in pdfplumber
+    coordinates, to a grayscale uint8 numpy array. Only the region is
+    rasterized, so a table crop at 300 DPI costs a fraction of the
+    full page. bbox=None renders the whole page.
+    """
+    width, height = pdfium_page.get_size()
+
+    if bbox is None:
+        crop = (0, 0, 0, 0)
+    else:
+        x0, top, x1, bottom = bbox
+        # pdfium crops by the amount to cut from (left, bottom, right, top)
+        crop = (
+            max(0, x0),
+            max(0, height - bottom),
+            max(0, width - x1),
+            max(0, top),
+        )
+
+    bitmap = pdfium_page.render(scale=dpi / 72, crop=crop, grayscale=True)
+    return bitmap.to_numpy()
+
+
+def iter_page_images(pdf_path, page_numbers=None, dpi=OCR_DPI):
+    """
+    Yield (page_number, grayscale array) one page at a time. Unlike
+    pdf2image.convert_from_path, nothing is rendered ahead and each
+    page is closed before the next one is rendered, so peak memory
+    stays at about one page image plus whatever the caller keeps.
+    page_numbers are 1-based, default all pages.
+    """
+    pdf = pdfium.PdfDocument(str(pdf_path))
+
+    try:
+        if page_numbers is None:
+            page_numbers = range(1, len(pdf) + 1)
+
+        for page_no in page_numbers:
+            if page_no < 1 or page_no > len(pdf):
+                continue
+
+            page = pdf[page_no - 1]
+            try:
+                image = render_region(page, None, dpi)
+            finally:
+                page.close()
+
+            yield page_no, image
+    finally:
+        pdf.close()
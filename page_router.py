@@ -0,0 +1,173 @@
+import json
+import re
+import sys
+
+import pdfplumber
+import pypdfium2 as pdfium
+
+import instrument
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+# Below this many characters per 1000 pt² (an A4 page of parts tables
+# has roughly 5-10) a page counts as scanned when images also cover at
+# least MIN_IMAGE_COVERAGE of it. Sparse pages without images (back
+# covers, contact pages) keep their text layer.
+MIN_CHAR_DENSITY = 0.5
+MIN_IMAGE_COVERAGE = 0.3
+
+# Share of glyphs pdfminer could not map (rendered as "(cid:N)", the
+# same garbage model_description.clean_line strips) above which the
+# text layer is treated as garbled
+MAX_CID_RATIO = 0.2
+
+CID_REGEX = re.compile(r"^\(cid:\d+\)$")
+
+TEXT = "text"
+OCR = "ocr"
+
+# ---------------------------------------------------
+# Text layer coverage
+# ---------------------------------------------------
+
+def image_coverage(page):
+    """Share of the page covered by images (overlaps counted twice, capped at 1)."""
+    covered = 0.0
+    for image in page.images:
+        width = min(page.width, image["x1"]) - max(0, image["x0"])
+        height = min(page.height, image["bottom"]) - max(0, image["top"])
+        covered += max(0, width) * max(0, height)
+    return min(1.0, covered / max(page.width * page.height, 1))
+
+
+def text_layer_stats(page):
+    chars = page.chars
+    area = max(page.width * page.height, 1)
+    cid = sum(1 for c in chars if CID_REGEX.match(c["text"]))
+
+    return {
+        "chars": len(chars),
+        "char_density": len(chars) * 1000 / area,
+        "cid_ratio": cid / len(chars) if chars else 0.0,
+        "image_coverage": image_coverage(page),
+    }
+
+
+def route_page(stats):
+    if stats["chars"] == 0:
+        return OCR
+    if stats["cid_ratio"] > MAX_CID_RATIO:
+        return OCR
+    if stats["char_density"] < MIN_CHAR_DENSITY and stats["image_coverage"] >= MIN_IMAGE_COVERAGE:
+        return OCR
+    return TEXT
+
+
+_warned_no_ocr = False
+
+
+def ocr_unavailable(error):
+    """Note (once) that OCR pages fall back to the text layer."""
+    global _warned_no_ocr
+    if not _warned_no_ocr:
+        print(f"OCR engine unavailable ({error}); using the text layer", file=sys.stderr)
+        _warned_no_ocr = True
+    instrument.count("pages.ocr_unavailable")
+
+# ---------------------------------------------------
+# Merged page stream
+# ---------------------------------------------------
+
+def iter_page_words(pdf_path, page_numbers=None):
+    """
+    Yield one dict per page:
+
+        {"page", "source", "text", "words", "stats"}
+
+    Pages with a usable text layer are read with pdfplumber, the rest
+    go through region OCR. In both cases "words" are extract_words()
+    style dicts in page points, so downstream parsers do not care
+    which source a page came from.
+    """
+    pdfium_doc = pdfium.PdfDocument(str(pdf_path))
+
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            if page_numbers is None:
+                page_numbers = range(1, len(pdf.pages) + 1)
+
+            for page_no in page_numbers:
+                page = pdf.pages[page_no - 1]
+
+                try:
+                    stats = text_layer_stats(page)
+                    source = route_page(stats)
+
+                    if source == OCR:
+                        import ocr_regions
+
+                        pdfium_page = pdfium_doc[page_no - 1]
+                        try:
+                            words = []
+                            for _, results in ocr_regions.ocr_page_regions(page, pdfium_page):
+                                words.extend(ocr_regions.results_to_words(results))
+                            text = "\n".join(w["text"] for w in words)
+                        except ImportError as e:
+                            ocr_unavailable(e)
+                            source = TEXT
+                        finally:
+                            pdfium_page.close()
+
+                    if source == TEXT:
+                        text = page.extract_text() or ""
+                        words = page.extract_words(use_text_flow=True)
+                finally:
+                    # Drop pdfplumber's per-page layout objects before the next page
+                    page.close()
+
+                yield {
+                    "page": page_no,
+                    "source": source,
+                    "text": text,
+                    "words": words,
+                    "stats": stats,
+                }
+    finally:
+        pdfium_doc.close()
+
+
+def extract_tables(page, pdfium_page):
+    """
+    page.extract_tables() for text pages, OCR-rebuilt matrices for
+    pages whose text layer is missing or garbled.
+    """
+    route = route_page(text_layer_stats(page))
+
+    with instrument.span("page.extract_tables", page=page.page_number, route=route):
+        if route == TEXT:
+            return page.extract_tables()
+
+        # OCR modules load only once a page actually needs them
+        import ocr_regions
+        try:
+            return ocr_regions.extract_tables_ocr(page, pdfium_page)
+        except ImportError as e:
+            ocr_unavailable(e)
+            return page.extract_tables()
+
+# ---------------------------------------------------
+# RUN
+# ---------------------------------------------------
+
+if __name__ == "__main__":
+    pdf_file = sys.argv[1] if len(sys.argv) > 1 else "PX03P.pdf"
+
+    with pdfplumber.open(pdf_file) as pdf:
+        routes = []
+        for i, page in enumerate(pdf.pages, 1):
+            stats = text_layer_stats(page)
+            routes.append({"page": i, "source": route_page(stats), **stats})
+
+    print(json.dumps(routes, indent=2))
@@ -0,0 +1,271 @@
+import contextlib
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import pdfplumber
+import pypdfium2 as pdfium
+
+import page_router
+import table_count_111
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+OUTPUT_DIR = Path("output/profile")
+
+# Seconds between stack samples for the flamegraph output
+SAMPLE_INTERVAL = 0.002
+
+# Functions listed per page in the slowest-pages report
+TOP_FUNCTIONS = 8
+
+# ---------------------------------------------------
+# Sampling profiler (flamegraph stacks)
+# ---------------------------------------------------
+
+class StackSampler:
+    """
+    Samples the calling thread's stack every `interval` seconds from a
+    background thread and counts them in folded form
+    ("module:func;module:func <count>"), as read by flamegraph.pl,
+    inferno and speedscope.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def folded(self):
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+# ---------------------------------------------------
+# cProfile per page and per table
+# ---------------------------------------------------
+
+class ProfileCollector:
+    """
+    cProfile stats aggregated by (manual, page, table index, classified
+    type). Table index and type are None for page-level work (table
+    finding), which cannot be split between tables.
+    """
+
+    def __init__(self):
+        self.stats = {}
+
+    @contextlib.contextmanager
+    def profile(self, key):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            if key in self.stats:
+                self.stats[key].add(profiler)
+            else:
+                self.stats[key] = pstats.Stats(profiler)
+
+    def rekey(self, old, new):
+        """Move stats once the classified type of a table is known."""
+        stats = self.stats.pop(old)
+        if new in self.stats:
+            self.stats[new].add(stats)
+        else:
+            self.stats[new] = stats
+
+    def page_stats(self, manual, page):
+        merged = pstats.Stats()
+        for (m, p, _, _), stats in self.stats.items():
+            if (m, p) == (manual, page):
+                merged.add(stats)
+        return merged
+
+
+def total_time(stats):
+    return stats.total_tt
+
+
+def top_functions(stats, limit=TOP_FUNCTIONS):
+    rows = []
+    for (filename, line, name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": f"{Path(filename).name}:{line}({name})",
+            "calls": ncalls,
+            "tottime_s": tottime,
+            "cumtime_s": cumtime,
+        })
+    rows.sort(key=lambda r: r["tottime_s"], reverse=True)
+    return rows[:limit]
+
+
+def profile_pdf(pdf_path, collector, samplers):
+    """
+    Profile table finding per page and DataFrame conversion,
+    classification and parsing per table. Each table is parsed on its
+    own here, so MANIFOLD tables that the pipeline concatenates per
+    page are costed separately.
+    """
+    manual = Path(pdf_path).name
+    failures = []
+
+    pdf = pdfplumber.open(pdf_path)
+    pdfium_doc = pdfium.PdfDocument(str(pdf_path))
+
+    try:
+        for page_no in range(1, len(pdf.pages) + 1):
+            page = pdf.pages[page_no - 1]
+            sampler = samplers[(manual, page_no)] = StackSampler()
+
+            try:
+                with sampler, contextlib.redirect_stdout(io.StringIO()):
+                    with collector.profile((manual, page_no, None, None)):
+                        pdfium_page = pdfium_doc[page_no - 1]
+                        try:
+                            tables = page_router.extract_tables(page, pdfium_page)
+                        finally:
+                            pdfium_page.close()
+
+                    for index, table in enumerate(tables or []):
+                        key = (manual, page_no, index, None)
+                        kind = None
+                        try:
+                            with collector.profile(key):
+                                for df in table_count_111.tables_to_dataframes([table]):
+                                    kind = table_count_111.classify_table(df)
+                                    if kind:
+                                        table_count_111.parse_all_tables([df], [kind])
+                        except Exception as e:
+                            failures.append({"page": page_no, "table": index, "error": f"{type(e).__name__}: {e}"})
+                        finally:
+                            collector.rekey(key, (manual, page_no, index, kind))
+
+            except Exception as e:
+                failures.append({"page": page_no, "table": None, "error": f"{type(e).__name__}: {e}"})
+
+            finally:
+                page.close()
+
+    finally:
+        pdf.close()
+        pdfium_doc.close()
+
+    return failures
+
+# ---------------------------------------------------
+# Reports
+# ---------------------------------------------------
+
+def slowest_pages(collector):
+    pages = {}
+    for (manual, page, index, kind), stats in collector.stats.items():
+        entry = pages.setdefault((manual, page), {"manual": manual, "page": page, "total_s": 0.0, "tables": []})
+        seconds = total_time(stats)
+        entry["total_s"] += seconds
+        if index is None:
+            entry["find_tables_s"] = seconds
+        else:
+            entry["tables"].append({"index": index, "type": kind, "seconds": seconds})
+
+    ranked = sorted(pages.values(), key=lambda p: p["total_s"], reverse=True)
+    for entry in ranked:
+        entry["tables"].sort(key=lambda t: t["index"])
+        entry["top_functions"] = top_functions(collector.page_stats(entry["manual"], entry["page"]))
+    return ranked
+
+
+def by_type(collector):
+    """Time per classified table type across every manual."""
+    totals = {}
+    for (_, _, index, kind), stats in collector.stats.items():
+        if index is None:
+            continue
+        entry = totals.setdefault(kind or "unclassified", {"tables": 0, "seconds": 0.0})
+        entry["tables"] += 1
+        entry["seconds"] += total_time(stats)
+    return dict(sorted(totals.items(), key=lambda kv: kv[1]["seconds"], reverse=True))
+
+
+def write_outputs(collector, samplers, failures, out_dir):
+    """
+    out_dir/
+        slowest_pages.json         ranked pages with per-table cost
+        <manual>/page-<n>.prof     pstats dump (snakeviz, gprof2dot)
+        <manual>/page-<n>.folded   sampled stacks (flamegraph.pl, speedscope)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    ranked = slowest_pages(collector)
+
+    for entry in ranked:
+        page_dir = out_dir / Path(entry["manual"]).stem
+        page_dir.mkdir(exist_ok=True)
+
+        collector.page_stats(entry["manual"], entry["page"]).dump_stats(page_dir / f"page-{entry['page']}.prof")
+
+        sampler = samplers.get((entry["manual"], entry["page"]))
+        if sampler is not None:
+            (page_dir / f"page-{entry['page']}.folded").write_text(sampler.folded(), encoding="utf-8")
+
+    report = {"pages": ranked, "by_type": by_type(collector), "failures": failures}
+    (out_dir / "slowest_pages.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return report
+
+
+def format_slowest(report, limit=10):
+    lines = [f"{'manual':<16} {'page':>4} {'total s':>8} {'find s':>7}  tables"]
+    for entry in report["pages"][:limit]:
+        tables = ", ".join(f"{t['index']}:{t['type'] or '-'} {t['seconds']:.2f}" for t in entry["tables"])
+        lines.append(
+            f"{entry['manual']:<16} {entry['page']:>4} {entry['total_s']:>8.2f} "
+            f"{entry.get('find_tables_s', 0.0):>7.2f}  {tables}"
+        )
+    return "\n".join(lines)
+
+
+def profile_manuals(pdf_files, out_dir=None):
+    out_dir = out_dir or OUTPUT_DIR / datetime.now().strftime("%Y%m%d-%H%M%S")
+    collector = ProfileCollector()
+    samplers = {}
+    failures = {}
+
+    for pdf_file in pdf_files:
+        print(f"profiling {pdf_file} ...", file=sys.stderr)
+        failures[Path(pdf_file).name] = profile_pdf(pdf_file, collector, samplers)
+
+    report = write_outputs(collector, samplers, failures, out_dir)
+    return report, out_dir
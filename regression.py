@@ -0,0 +1,347 @@
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+BASELINE_FILE = Path("output/benchmarks/regression_baseline.json")
+
+# Fail when a case's pages/s drops more than this share below baseline
+THROUGHPUT_THRESHOLD = 0.2
+
+# Timed extraction runs per case; the fastest one counts
+REPEAT = 3
+
+# Slack for float noise when comparing precision / recall to baseline
+ACCURACY_EPSILON = 1e-9
+
+# Absolute precision / recall a case must reach whatever the baseline
+# says, unless the case sets its own "min_precision" / "min_recall"
+MIN_PRECISION = 0.9
+MIN_RECALL = 0.9
+
+# ---------------------------------------------------
+# Extractors (imported lazily so one broken module only fails its case)
+# ---------------------------------------------------
+
+def extract_ball_options(pdf, page):
+    import ball_new_final_latest
+    return ball_new_final_latest.extract_ball_options_from_pdf(pdf, page)
+
+
+def extract_seat_options(pdf, page):
+    import seat_options
+    return seat_options.extract_seat_options_from_pdf(pdf, page)
+
+
+def extract_air_section(pdf, page):
+    import air_section_2
+    return air_section_2.extract_from_pdf(pdf, page)
+
+
+def extract_manual_parts(pdf, page):
+    import fluid_connection1
+    return fluid_connection1.extract_parts_from_pdf(pdf, page)
+
+
+def extract_manifold_bom(pdf, page):
+    import bom_engine
+    import mainfold_fluid_1
+    import table_count_111
+
+    dfs = table_count_111.extract_tables_as_dataframes(pdf, page)
+    manifold = [df for df in dfs if table_count_111.classify_table(df) == "mainfold"]
+    return bom_engine.manifold_rows(mainfold_fluid_1.extract_manifold_json_from_dfs(manifold))
+
+# ---------------------------------------------------
+# Record keys
+# ---------------------------------------------------
+
+def field(value):
+    return " ".join(str(value).split()) if value is not None else ""
+
+
+def option_keys(records):
+    return [
+        (field(r["code"]), field(r["part_number"]), field(r["qty"]), field(r["material"]))
+        for r in records
+    ]
+
+
+def air_section_keys(records):
+    return [
+        (field(r["item"]), field(r["description"]), field(r["part_no"]),
+         field(r["qty"]), field(r["material"]))
+        for r in records
+    ]
+
+
+def manual_parts_keys(records):
+    return [
+        (field(r["Page"]), field(r["Item"]), field(r["Description"]), field(r["Variant"]),
+         field(r["Part_No"]), field(r["Material"]), field(r["Qty"]))
+        for r in records
+    ]
+
+
+def manifold_bom_keys(variants):
+    return [
+        (field(variant), field(r["item"]), field(r["description"]),
+         field(r["part_no"]), field(r["material"]), field(r["qty"]))
+        for variant, items in variants.items()
+        for r in items
+    ]
+
+# ---------------------------------------------------
+# Golden cases
+# ---------------------------------------------------
+
+# Each golden file with the manual page it was cut from and the
+# extractor that produced it. "manual.pdf" (PX01X) and "manual2.pdf"
+# are not bundled; point --pdf at them, or pass --allow-skipped.
+GOLDEN_CASES = [
+    {
+        "name": "ball_options",
+        "golden": Path("ball_options.json"),
+        "pdf": "PX07P.pdf",
+        "page": 5,
+        "extract": extract_ball_options,
+        "keys": option_keys,
+        "min_precision": 1.0,
+        "min_recall": 1.0,
+    },
+    {
+        # The -HPS / -HKS / -HDS seat rows only exist in the PX01 manual
+        "name": "seat_options",
+        "golden": Path("seat_options.json"),
+        "pdf": "manual.pdf",
+        "page": 5,
+        "extract": extract_seat_options,
+        "keys": option_keys,
+    },
+    {
+        "name": "air_section_parts",
+        "golden": Path("air_section_parts.json"),
+        "pdf": "manual2.pdf",
+        "page": 8,
+        "extract": extract_air_section,
+        "keys": air_section_keys,
+    },
+    {
+        "name": "manual_parts",
+        "golden": Path("output/manual_parts.json"),
+        "pdf": "manual.pdf",
+        "page": 5,
+        "extract": extract_manual_parts,
+        "keys": manual_parts_keys,
+    },
+    {
+        "name": "final_bom",
+        "golden": Path("final_bom.json"),
+        "pdf": "manual.pdf",
+        "page": 5,
+        "extract": extract_manifold_bom,
+        "keys": manifold_bom_keys,
+    },
+]
+
+# ---------------------------------------------------
+# Scoring
+# ---------------------------------------------------
+
+def score(expected, actual):
+    """Record-level precision / recall over multisets of record keys."""
+    expected = Counter(expected)
+    actual = Counter(actual)
+    matched = sum((expected & actual).values())
+
+    n_expected = sum(expected.values())
+    n_actual = sum(actual.values())
+
+    return {
+        "expected": n_expected,
+        "extracted": n_actual,
+        "matched": matched,
+        "precision": matched / n_actual if n_actual else (1.0 if not n_expected else 0.0),
+        "recall": matched / n_expected if n_expected else 1.0,
+        "missing": [list(k) for k in (expected - actual).elements()],
+        "unexpected": [list(k) for k in (actual - expected).elements()],
+    }
+
+
+def run_case(case, pdf=None, repeat=REPEAT):
+    pdf = pdf or case["pdf"]
+    result = {
+        "name": case["name"],
+        "pdf": pdf,
+        "page": case["page"],
+        "min_precision": case.get("min_precision", MIN_PRECISION),
+        "min_recall": case.get("min_recall", MIN_RECALL),
+    }
+
+    if not Path(pdf).exists():
+        result["status"] = "skipped"
+        result["reason"] = f"source PDF not found: {pdf}"
+        return result
+
+    with open(case["golden"], encoding="utf-8") as f:
+        golden = json.load(f)
+
+    best = None
+    try:
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                records = case["extract"](pdf, case["page"])
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    except Exception as e:
+        result["status"] = "error"
+        result["reason"] = f"{type(e).__name__}: {e}"
+        return result
+
+    result.update(score(case["keys"](golden), case["keys"](records)))
+    result["status"] = "ok"
+    result["wall_s"] = best
+    result["pages_per_s"] = 1 / best if best else None
+    result["records_per_s"] = result["extracted"] / best if best else None
+    return result
+
+# ---------------------------------------------------
+# Baseline gate
+# ---------------------------------------------------
+
+def load_baseline(path=BASELINE_FILE):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results, path=BASELINE_FILE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    baseline = {
+        r["name"]: {k: r[k] for k in ("pdf", "precision", "recall", "pages_per_s")}
+        for r in results
+        if r["status"] == "ok"
+    }
+    path.write_text(json.dumps(baseline, indent=2), encoding="utf-8")
+
+
+def failures(results, allow_skipped=False):
+    """
+    Problems that fail a run with or without a baseline: errors,
+    skipped cases and precision / recall under the case's floor.
+    """
+    problems = []
+
+    for r in results:
+        if r["status"] == "error":
+            problems.append(f"{r['name']}: {r['reason']}")
+            continue
+        if r["status"] == "skipped":
+            if not allow_skipped:
+                problems.append(f"{r['name']}: skipped, {r['reason']}")
+            continue
+
+        for metric in ("precision", "recall"):
+            floor = r[f"min_{metric}"]
+            if r[metric] < floor - ACCURACY_EPSILON:
+                problems.append(f"{r['name']}: {metric} {r[metric]:.3f} < floor {floor:.3f}")
+
+    return problems
+
+
+def regressions(results, baseline, threshold=THROUGHPUT_THRESHOLD):
+    """Reasons this run is worse than the baseline, one string per problem."""
+    problems = []
+
+    for r in results:
+        if r["status"] != "ok":
+            continue
+
+        base = baseline.get(r["name"])
+        if not base:
+            problems.append(f"{r['name']}: not in the baseline (run with --update-baseline)")
+            continue
+
+        for metric in ("precision", "recall"):
+            if r[metric] < base[metric] - ACCURACY_EPSILON:
+                problems.append(f"{r['name']}: {metric} {r[metric]:.3f} < baseline {base[metric]:.3f}")
+
+        if base.get("pages_per_s") and r["pages_per_s"] is not None:
+            floor = base["pages_per_s"] * (1 - threshold)
+            if r["pages_per_s"] < floor:
+                problems.append(
+                    f"{r['name']}: {r['pages_per_s']:.2f} pages/s < {floor:.2f} "
+                    f"(baseline {base['pages_per_s']:.2f} - {threshold:.0%})"
+                )
+
+    return problems
+
+
+def run_regression(pdf_overrides=None, repeat=REPEAT):
+    pdf_overrides = pdf_overrides or {}
+    return [
+        run_case(case, pdf_overrides.get(case["pdf"]), repeat)
+        for case in GOLDEN_CASES
+    ]
+
+# ---------------------------------------------------
+# RUN
+# ---------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check extractors against the golden JSON files.")
+    parser.add_argument("--pdf", action="append", default=[], metavar="NAME=PATH",
+                        help="use PATH wherever a case names NAME (e.g. manual.pdf=/data/PX01X.pdf)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--threshold", type=float, default=THROUGHPUT_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="save this run as the baseline (only if it passes the floors)")
+    parser.add_argument("--allow-skipped", action="store_true",
+                        help="do not fail on cases whose source PDF is missing")
+    parser.add_argument("--output", type=Path, help="write the full per-case results as JSON")
+    args = parser.parse_args()
+
+    overrides = dict(item.split("=", 1) for item in args.pdf)
+    results = run_regression(overrides, args.repeat)
+
+    for r in results:
+        if r["status"] == "ok":
+            print(f"{r['name']:<20} P={r['precision']:.3f} R={r['recall']:.3f} "
+                  f"({r['matched']}/{r['expected']})  {r['pages_per_s']:.2f} pages/s")
+        else:
+            print(f"{r['name']:<20} {r['status']}: {r['reason']}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    problems = failures(results, args.allow_skipped)
+
+    if args.update_baseline:
+        if not problems:
+            save_baseline(results, args.baseline)
+            print(f"\nbaseline saved to {args.baseline}")
+    elif not args.baseline.exists():
+        problems.append(f"no baseline at {args.baseline} (run with --update-baseline)")
+    else:
+        problems += regressions(results, load_baseline(args.baseline), args.threshold)
+
+    if problems:
+        print("\nREGRESSIONS:")
+        for p in problems:
+            print(f"  {p}")
+        sys.exit(1)
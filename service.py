@@ -0,0 +1,327 @@
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs
+
+import extract
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+# Pages whose extracted tables are kept in memory, across all PDFs
+CACHE_PAGES = int(os.environ.get("EXTRACT_CACHE_PAGES", "2048"))
+
+# Largest PDF accepted by POST /extract
+MAX_UPLOAD_MB = int(os.environ.get("EXTRACT_MAX_UPLOAD_MB", "100"))
+
+# EXTRACT_WARM_OCR=1 builds the easyocr reader at startup instead of
+# on the first scanned page
+WARM_OCR = os.environ.get("EXTRACT_WARM_OCR", "0") != "0"
+
+MB = 1024 * 1024
+
+# ---------------------------------------------------
+# Page / table cache
+# ---------------------------------------------------
+
+class LRU:
+    """Small least-recently-used dict with hit / miss counts."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+def pdf_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def warm_imports(warm_ocr=False):
+    """
+    Import the pipeline and every section parser now rather than on
+    the first request; with warm_ocr, also build the easyocr reader.
+    Returns whether the reader is ready.
+    """
+    import page_router
+    import table_count_111
+    import common_parts_new, diaphrgm_3, mainfold_fluid_1, seat_options
+    import ocr_regions
+
+    if not warm_ocr:
+        return False
+
+    import ocr_engine
+
+    try:
+        ocr_engine.get_reader()
+    except ImportError as e:
+        print(f"OCR not warmed: {e}", file=sys.stderr)
+        return False
+    return True
+
+# ---------------------------------------------------
+# Warm extractor
+# ---------------------------------------------------
+
+class Extractor:
+    """
+    Keeps everything a request would otherwise pay for again:
+    pandas / pdfplumber / the section parsers imported once, the easyocr
+    reader built once (ocr_engine caches it per process), and the raw
+    table matrices of every page seen, keyed by PDF hash and page.
+
+    pdfium is not thread-safe, so extraction runs one request at a time.
+    """
+
+    def __init__(self, cache_pages=CACHE_PAGES, warm_ocr=WARM_OCR):
+        self.tables = LRU(cache_pages)
+        self.page_counts = LRU(cache_pages)
+        self.warm_ocr = warm_ocr
+        self.ocr_ready = False
+        self.started = time.time()
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def warm(self):
+        self.ocr_ready = warm_imports(self.warm_ocr)
+
+    def page_tables(self, digest, pdf, pdfium_doc, page_no):
+        import page_router
+
+        key = (digest, page_no)
+        tables = self.tables.get(key)
+        if tables is None:
+            page = pdf.pages[page_no - 1]
+            pdfium_page = pdfium_doc[page_no - 1]
+            try:
+                tables = page_router.extract_tables(page, pdfium_page)
+            finally:
+                pdfium_page.close()
+                page.close()
+            self.tables.put(key, tables)
+        return tables
+
+    def run(self, data, pages=None, sections=None):
+        """
+        Parsed sections per page of a PDF given as bytes. Pages whose
+        tables are cached never open the PDF.
+        """
+        import pdfplumber
+        import pypdfium2 as pdfium
+
+        import table_count_111
+
+        digest = pdf_digest(data)
+        started = time.perf_counter()
+        results = {}
+        failures = []
+
+        with self._lock:
+            self.requests += 1
+            hits = self.tables.hits
+            pdf = pdfium_doc = None
+
+            try:
+                page_count = self.page_counts.get(digest)
+                wanted = pages or range(1, (page_count or 0) + 1)
+
+                if page_count is None or any((digest, p) not in self.tables for p in wanted):
+                    pdf = pdfplumber.open(io.BytesIO(data))
+                    pdfium_doc = pdfium.PdfDocument(data)
+                    page_count = len(pdf.pages)
+                    self.page_counts.put(digest, page_count)
+                    wanted = pages or range(1, page_count + 1)
+
+                for page_no in wanted:
+                    if not 1 <= page_no <= page_count:
+                        failures.append({"page": page_no, "error": f"no page {page_no} (PDF has {page_count})"})
+                        continue
+                    try:
+                        tables = self.page_tables(digest, pdf, pdfium_doc, page_no)
+                        dfs = table_count_111.tables_to_dataframes(tables)
+                        results[page_no] = extract.parse_dataframes(dfs, sections)
+                    except Exception as e:
+                        failures.append({"page": page_no, "error": f"{type(e).__name__}: {e}"})
+
+            finally:
+                if pdf is not None:
+                    pdf.close()
+                    pdfium_doc.close()
+
+            cached = self.tables.hits - hits
+
+        return {
+            "pdf_sha256": digest,
+            "pages": results,
+            "failures": failures,
+            "cached_pages": cached,
+            "elapsed_s": time.perf_counter() - started,
+        }
+
+    def health(self):
+        return {
+            "status": "ok",
+            "uptime_s": time.time() - self.started,
+            "requests": self.requests,
+            "ocr_ready": self.ocr_ready,
+            "table_cache": self.tables.stats(),
+        }
+
+# ---------------------------------------------------
+# ASGI app (served by uvicorn)
+# ---------------------------------------------------
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_request_options(query_string):
+    """?pages=5,6&sections=common_parts,mainfold -> (pages, sections)"""
+    query = parse_qs(query_string.decode("latin-1"))
+
+    def listed(name):
+        return [v for value in query.get(name, []) for v in value.split(",") if v]
+
+    try:
+        pages = [int(p) for p in listed("pages")] or None
+    except ValueError:
+        raise HttpError(400, "pages must be comma-separated page numbers")
+
+    sections = listed("sections") or None
+    unknown = sorted(set(sections or []) - set(extract.SECTIONS))
+    if unknown:
+        raise HttpError(400, f"unknown sections {unknown}; expected some of {list(extract.SECTIONS)}")
+
+    return pages, sections
+
+
+async def read_body(receive, limit=MAX_UPLOAD_MB * MB):
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HttpError(400, "client disconnected")
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            raise HttpError(413, f"PDF larger than {limit // MB} MB")
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def send_json(send, status, payload, headers=()):
+    body = json.dumps(payload, default=str).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                    *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class ExtractionService:
+    """
+    POST /extract?sections=common_parts,mainfold&pages=5
+        body: the PDF bytes; returns parsed sections per page as JSON
+    GET /health
+        uptime, request count and cache hit rate
+    """
+
+    def __init__(self, extractor=None):
+        self.extractor = extractor or Extractor()
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await asyncio.to_thread(self.extractor.warm)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+
+        method, path = scope["method"], scope["path"]
+        try:
+            if path == "/health" and method == "GET":
+                return await send_json(send, 200, self.extractor.health())
+
+            if path == "/extract" and method == "POST":
+                pages, sections = parse_request_options(scope.get("query_string", b""))
+                data = await read_body(receive)
+                if not data.startswith(b"%PDF"):
+                    raise HttpError(400, "request body is not a PDF")
+                result = await asyncio.to_thread(self.extractor.run, data, pages, sections)
+                return await send_json(send, 200, result)
+
+            raise HttpError(404, f"no route {method} {path}")
+
+        except HttpError as e:
+            await send_json(send, e.status, {"error": str(e)})
+
+
+app = ExtractionService()
+
+# ---------------------------------------------------
+# RUN
+# ---------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resident extraction service with warm imports and caches.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--uds", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--cache-pages", type=int, default=CACHE_PAGES)
+    parser.add_argument("--warm-ocr", action="store_true", default=WARM_OCR,
+                        help="build the easyocr reader at startup")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app.extractor = Extractor(args.cache_pages, args.warm_ocr)
+
+    # One process: the warm state and caches live in it
+    uvicorn.run(app, host=args.host, port=args.port, uds=args.uds, workers=1, log_level="info")
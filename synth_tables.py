@@ -0,0 +1,510 @@
+import argparse
+import json
+import math
+import random
+import sys
+import zlib
+from pathlib import Path
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 36
+TABLE_GAP = 18
+
+ROW_HEIGHT = 14
+FONT_SIZE = 7
+
+# Helvetica averages about half an em per character
+CHAR_WIDTH = 0.5
+
+KINDS = ("common_parts", "manifold", "diaphragm", "seat_ball")
+
+MATERIALS = ["A", "B", "D", "E", "GA", "GFN", "H", "K", "L", "P", "Sp", "SS", "T", "U", "V"]
+
+DESCRIPTIONS = [
+    "Connecting Rod", "Washer, Diaphragm", "Flange Bolt (5/16 - 18 x 7/8)",
+    "Bolt (5/16 - 18 x 1-1/4)", "Hex Flange Nut (5/16 - 18)", "Logo Plate",
+    "Diaphragm Nut", "Fluid Cap", "Inlet Manifold", "Outlet Manifold",
+    "Bushing", "Center Body", "Bottom Gasket", "Pilot Rod", "Spacer",
+    "Screw (10-24 x 1/2)", "Muffler", "Air Valve Gasket", "Spring", "Seal",
+]
+
+# Manifold grids always list the fluid caps and manifolds (the
+# classifier keys on them), then fasteners
+MANIFOLD_DESCRIPTIONS = [
+    "Fluid Cap", "Inlet Manifold", "Outlet Manifold", "Diaphragm Nut",
+    "Elbow (NPT)", "Elbow (BSP)", "Flange Bolt", "Manifold Screw",
+]
+
+FAMILIES = ["PX01X", "PX03P", "PX05P", "PX07P", "PX10P", "PX20P", "PX20X"]
+
+# ---------------------------------------------------
+# Cell values
+# ---------------------------------------------------
+
+def model_code(rng):
+    return f"{rng.choice(FAMILIES)}-XXX-XXX-{rng.choice('ABC')}XXX"
+
+
+def part_no(rng):
+    base = str(rng.randint(90000, 97999))
+    return base if rng.random() < 0.5 else f"{base}-{rng.randint(1, 9)}"
+
+
+def mtl(rng):
+    return f"[{rng.choice(MATERIALS)}]"
+
+
+def qty(rng):
+    return f"({rng.choice((1, 2, 2, 4, 4, 8, 20))})"
+
+
+def title_row(title, width):
+    return [title] + [None] * (width - 1)
+
+
+def option_letters(rng, n):
+    letters = rng.sample("ABCDEFGHKLMNPRSTUVWZ", min(n, 20))
+    return letters + [str(i) for i in range(n - len(letters))]
+
+# ---------------------------------------------------
+# Table matrices (extract_tables() shape, None = spanned cell)
+# ---------------------------------------------------
+
+def common_parts_matrix(rng, rows, model=None):
+    """COMMON PARTS: two Item/Description/[Mtl]/Qty/Part no halves side by side."""
+    model = model or model_code(rng)
+    half = ["Item", "Description", "[Mtl]", "Qty", "Part no"]
+
+    matrix = [
+        title_row("COMMON PARTS", 10),
+        [model, None, None, None, None, model, None, None, None, None],
+        half + half,
+    ]
+
+    items = sorted(rng.sample(range(1, max(200, rows * 4 + 1)), rows * 2))
+    for left, right in zip(items[:rows], items[rows:]):
+        matrix.append(
+            [str(left), rng.choice(DESCRIPTIONS), mtl(rng), qty(rng), part_no(rng),
+             str(right), rng.choice(DESCRIPTIONS), mtl(rng), qty(rng), part_no(rng)]
+        )
+    return matrix
+
+
+def manifold_matrix(rng, rows, model=None, variants=6):
+    """MANIFOLD / FLUID CAP: Item/Description/Qty then Part no/[Mtl] per model variant."""
+    model = model or model_code(rng)
+    family = model.split("-")[0]
+    width = 3 + 2 * variants
+
+    codes = [f"{family}-X{c}S" for c in option_letters(rng, variants)]
+    variant_row = ["", None, ""]
+    for code in codes:
+        variant_row += [code, None]
+
+    matrix = [
+        title_row("MANIFOLD / FLUID CAP MATERIAL", width),
+        title_row(model, width),
+        variant_row,
+        ["Item", "Description", "Qty"] + ["Part no", "[Mtl]"] * variants,
+    ]
+
+    # Every eight rows list a fluid cap and both manifolds again, so each
+    # page of a grid long enough to be paginated still classifies
+    descriptions = [
+        MANIFOLD_DESCRIPTIONS[i % 8] if i % 8 < 3 else rng.choice(MANIFOLD_DESCRIPTIONS[3:])
+        for i in range(rows)
+    ]
+
+    for item, description in zip(sorted(rng.sample(range(1, max(100, rows * 4 + 1)), rows)), descriptions):
+        row = [str(item), description, qty(rng)]
+        for _ in range(variants):
+            row += [part_no(rng), mtl(rng)] if rng.random() < 0.9 else ["---", "---"]
+        matrix.append(row)
+    return matrix
+
+
+def diaphragm_matrix(rng, rows, model=None, kits=2, groups=4):
+    """DIAPHRAGM OPTIONS: option code, service kits, then Part/Qty/[Mtl] groups (15 columns by default)."""
+    model = model or model_code(rng)
+    width = 1 + kits + 3 * groups
+
+    group_row = ["-XXX"] + [f"Service Kit {k + 1}" for k in range(kits)]
+    header = [None] + ["-XX = (Diaphragm)"] * kits
+    for g in range(groups):
+        group_row += [f'"{7 + g}"', None, None]
+        header += ["Diaphragm" if g < 2 else '"O" Ring', "Qty", "[Mtl]"]
+
+    matrix = [title_row(f"DIAPHRAGM OPTIONS {model}", width), group_row, header]
+
+    kit_base = rng.randint(637000, 637999)
+    for letter in option_letters(rng, rows):
+        row = [f"-XX{letter}"] + [f"{kit_base}-{'X' * (k + 1)}{letter}" for k in range(kits)]
+        for _ in range(groups):
+            row += [part_no(rng), qty(rng), mtl(rng)] if rng.random() < 0.85 else ["-----", "---", "---"]
+        matrix.append(row)
+    return matrix
+
+
+def seat_ball_matrix(rng, rows, model=None, ball_blocks=2):
+    """
+    SEAT OPTIONS block and BALL OPTIONS blocks, 4 columns each
+    (-XXX/part/Qty/[Mtl]), under a title row and a figure callout row
+    as in the manuals (seat_options reads data from the fourth row).
+    """
+    model = model or model_code(rng)
+    width = 4 + 5 * ball_blocks
+
+    callouts = ['"21"', None, None, None]
+    for b in range(ball_blocks):
+        callouts += ["", f'"{22 + b}"', None, None, None]
+
+    matrix = [
+        [f"SEAT OPTIONS {model}", None, None, None, ""]
+        + [f"BALL OPTIONS {model}"] + [None] * (width - 6),
+        callouts,
+        ["-XXX", "Seat", "Qty", "[Mtl]"] + ["", "-XXX", "Ball", "Qty", "[Mtl]"] * ball_blocks,
+    ]
+
+    seats = option_letters(rng, rows)
+    balls = option_letters(rng, rows * ball_blocks)
+    for r in range(rows):
+        row = [f"-{seats[r]}XX", part_no(rng), qty(rng), mtl(rng)]
+        for b in range(ball_blocks):
+            row += ["", f"-X{balls[r * ball_blocks + b]}X", part_no(rng), qty(rng), mtl(rng)]
+        matrix.append(row)
+    return matrix
+
+
+BUILDERS = {
+    "common_parts": common_parts_matrix,
+    "manifold": manifold_matrix,
+    "diaphragm": diaphragm_matrix,
+    "seat_ball": seat_ball_matrix,
+}
+
+# Title and header rows of each kind, repeated above the rows a table
+# carries over to the next page
+HEADER_ROWS = {
+    "common_parts": 3,
+    "manifold": 4,
+    "diaphragm": 3,
+    "seat_ball": 3,
+}
+
+# Sections table_count_111.classify_table gives each kind
+SECTIONS = {
+    "common_parts": {"common_parts"},
+    "manifold": {"mainfold"},
+    "diaphragm": {"dipram"},
+    "seat_ball": {"seat", "ball"},
+}
+
+
+def iter_pages(pages, tables_per_page=3, rows=8, row_jitter=2, kinds=KINDS, seed=0):
+    """
+    Yield (page_number, [(kind, matrix), ...]) for a synthetic manual.
+    Each page gets tables_per_page tables of randomly chosen kinds with
+    rows +/- row_jitter data rows; the same seed gives the same manual.
+    """
+    rng = random.Random(seed)
+
+    for page_no in range(1, pages + 1):
+        model = model_code(rng)
+        tables = []
+        for _ in range(tables_per_page):
+            kind = rng.choice(kinds)
+            n = max(1, rows + rng.randint(-row_jitter, row_jitter))
+            tables.append((kind, BUILDERS[kind](rng, n, model)))
+        yield page_no, tables
+
+
+def paginate(pages, height=PAGE_HEIGHT):
+    """
+    Lay the tables of iter_pages() out on PDF pages at full row height.
+    Each generated page starts a new PDF page; a table that does not fit
+    moves to the next one, and one taller than a page continues there
+    under its header rows. A table as long as the one above it also
+    moves on, since tables_to_dataframes merges equal-length neighbours
+    as side-by-side halves. Yields (pdf_page_number, [(kind, matrix), ...]).
+    """
+    bottom = height - MARGIN
+    capacity = int((bottom - MARGIN) // ROW_HEIGHT)
+    pdf_page = 0
+
+    for _, tables in pages:
+        placed, top = [], MARGIN
+
+        for kind, matrix in tables:
+            head = HEADER_ROWS[kind]
+            body = matrix[head:]
+
+            # Even chunks, so no page gets only a few trailing rows
+            chunks = max(math.ceil(len(body) / max(capacity - head, 1)), 1)
+            per_page = max(math.ceil(len(body) / chunks), 1)
+
+            for start in range(0, max(len(body), 1), per_page):
+                chunk = matrix[:head] + body[start:start + per_page]
+                fits = top + len(chunk) * ROW_HEIGHT <= bottom
+
+                if placed and (not fits or len(chunk) == len(placed[-1][1])):
+                    pdf_page += 1
+                    yield pdf_page, placed
+                    placed, top = [], MARGIN
+
+                placed.append((kind, chunk))
+                top += len(chunk) * ROW_HEIGHT + TABLE_GAP
+
+        if placed:
+            pdf_page += 1
+            yield pdf_page, placed
+
+# ---------------------------------------------------
+# Minimal PDF writer (Helvetica text + ruled lines)
+# ---------------------------------------------------
+
+def pdf_string(text):
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+class PageCanvas:
+    """Collects drawing operators in pdfplumber's top-down coordinates."""
+
+    def __init__(self, height=PAGE_HEIGHT):
+        self.height = height
+        self.ops = ["0.5 w"]
+
+    def line(self, x0, top, x1, bottom):
+        self.ops.append(f"{x0:.2f} {self.height - top:.2f} m {x1:.2f} {self.height - bottom:.2f} l S")
+
+    def text(self, x, top, text, size=FONT_SIZE):
+        baseline = self.height - top - size
+        self.ops.append(f"BT /F1 {size:g} Tf {x:.2f} {baseline:.2f} Td {pdf_string(text)} Tj ET")
+
+    def content(self):
+        return "\n".join(self.ops).encode("latin-1")
+
+
+class PdfWriter:
+    """
+    Streams pages straight to disk, so manuals with tens of thousands
+    of pages are written in constant memory (apart from the xref).
+    """
+
+    def __init__(self, path, width=PAGE_WIDTH, height=PAGE_HEIGHT):
+        self.width = width
+        self.height = height
+        self.file = open(path, "wb")
+        self.offsets = {}
+        self.page_ids = []
+        self.next_id = 4  # 1 catalog, 2 page tree, 3 font
+
+        self.file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    def _object(self, object_id, body):
+        self.offsets[object_id] = self.file.tell()
+        self.file.write(f"{object_id} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    def add_page(self, content):
+        data = zlib.compress(content)
+        content_id, page_id = self.next_id, self.next_id + 1
+        self.next_id += 2
+
+        self._object(
+            content_id,
+            f"<< /Length {len(data)} /Filter /FlateDecode >>\nstream\n".encode() + data + b"\nendstream",
+        )
+        self._object(
+            page_id,
+            (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.width} {self.height}] "
+             f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>").encode(),
+        )
+        self.page_ids.append(page_id)
+
+    def close(self):
+        kids = " ".join(f"{i} 0 R" for i in self.page_ids)
+        self._object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode())
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+        xref = self.file.tell()
+        size = self.next_id
+        self.file.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode())
+        for object_id in range(1, size):
+            self.file.write(f"{self.offsets[object_id]:010d} 00000 n \n".encode())
+        self.file.write(f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ---------------------------------------------------
+# Table drawing
+# ---------------------------------------------------
+
+def column_widths(matrix, total):
+    cols = len(matrix[0])
+    weights = [2.0] * cols
+    for row in matrix:
+        for c, cell in enumerate(row):
+            if cell is not None and (c + 1 == len(row) or row[c + 1] is not None):
+                weights[c] = max(weights[c], len(cell))
+    scale = total / sum(weights)
+    return [w * scale for w in weights]
+
+
+def draw_table(canvas, matrix, top, row_height=ROW_HEIGHT, font_size=FONT_SIZE,
+               left=MARGIN, width=PAGE_WIDTH - 2 * MARGIN):
+    """
+    Draw a ruled grid for the matrix starting at `top`; None cells
+    continue the cell to their left (no rule between them). Returns
+    the bottom of the table.
+    """
+    widths = column_widths(matrix, width)
+    xs = [left]
+    for w in widths:
+        xs.append(xs[-1] + w)
+
+    bottom = top + row_height * len(matrix)
+    canvas.line(left, top, xs[-1], top)
+
+    for r, row in enumerate(matrix):
+        y0 = top + r * row_height
+        y1 = y0 + row_height
+        canvas.line(left, y1, xs[-1], y1)
+
+        c = 0
+        while c < len(row):
+            end = c + 1
+            while end < len(row) and row[end] is None:
+                end += 1
+
+            canvas.line(xs[c], y0, xs[c], y1)
+            text = row[c] or ""
+            max_chars = int((xs[end] - xs[c] - 3) / (font_size * CHAR_WIDTH))
+            if text and max_chars > 0:
+                canvas.text(xs[c] + 1.5, y0 + (row_height - font_size) / 2, text[:max_chars], font_size)
+            c = end
+
+        canvas.line(xs[-1], y0, xs[-1], y1)
+
+    return bottom
+
+
+def draw_page(tables, height=PAGE_HEIGHT):
+    """Stack the page's tables top to bottom (laid out by paginate)."""
+    canvas = PageCanvas(height)
+
+    top = MARGIN
+    for _, matrix in tables:
+        top = draw_table(canvas, matrix, top) + TABLE_GAP
+
+    return canvas.content()
+
+
+def write_manual(pdf_path, pages, matrices_path=None, **options):
+    """
+    Write a synthetic manual PDF and, optionally, the source matrices
+    as JSON lines ({"page", "tables": [{"kind", "matrix"}]}) to compare
+    extract_tables() output against. `pages` generated pages can take
+    more PDF pages once long tables overflow; returns the PDF page count.
+    """
+    matrices = open(matrices_path, "w", encoding="utf-8") if matrices_path else None
+    page_no = 0
+
+    try:
+        with PdfWriter(pdf_path) as writer:
+            for page_no, tables in paginate(iter_pages(pages, **options)):
+                writer.add_page(draw_page(tables))
+                if matrices:
+                    matrices.write(json.dumps({
+                        "page": page_no,
+                        "tables": [{"kind": k, "matrix": m} for k, m in tables],
+                    }) + "\n")
+    finally:
+        if matrices:
+            matrices.close()
+
+    return page_no
+
+# ---------------------------------------------------
+# Round trip
+# ---------------------------------------------------
+
+def check_manual(pdf_path, matrices_path):
+    """
+    Run every page of a written manual through table_count_111 (tables,
+    classify_table, parse_all_tables) and compare the sections found
+    with the kinds drawn there. Returns one message per mismatch.
+    """
+    import contextlib
+    import io
+
+    import pdfplumber
+    import table_count_111
+
+    with open(matrices_path, encoding="utf-8") as f:
+        drawn = {row["page"]: [t["kind"] for t in row["tables"]] for row in map(json.loads, f)}
+
+    problems = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_no, page in enumerate(pdf.pages, 1):
+            expected = set().union(*(SECTIONS[kind] for kind in drawn.get(page_no, [])))
+
+            dfs = table_count_111.tables_to_dataframes(page.extract_tables())
+            kinds = [table_count_111.classify_table(df) for df in dfs]
+            found = {kind for kind in kinds if kind}
+            if found != expected:
+                problems.append(f"page {page_no}: drawn {sorted(expected)}, classified {sorted(found)}")
+
+            try:
+                # The section parsers print their intermediate frames
+                with contextlib.redirect_stdout(io.StringIO()):
+                    table_count_111.parse_all_tables(dfs, kinds)
+            except Exception as e:
+                problems.append(f"page {page_no}: parse_all_tables raised {type(e).__name__}: {e}")
+
+    return problems
+
+# ---------------------------------------------------
+# RUN
+# ---------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic parts-list manual.")
+    parser.add_argument("pdf", type=Path)
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--tables-per-page", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=8, help="data rows per table (+/- --row-jitter)")
+    parser.add_argument("--row-jitter", type=int, default=2)
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--matrices", type=Path, help="also write the source matrices as JSON lines")
+    parser.add_argument("--check", action="store_true",
+                        help="parse the written manual back and compare sections with --matrices")
+    args = parser.parse_args()
+
+    if args.check and not args.matrices:
+        parser.error("--check needs --matrices")
+
+    written = write_manual(
+        args.pdf, args.pages, args.matrices,
+        tables_per_page=args.tables_per_page, rows=args.rows,
+        row_jitter=args.row_jitter, kinds=tuple(args.kinds), seed=args.seed,
+    )
+    print(f"wrote {written} pages to {args.pdf}")
+
+    if args.check:
+        problems = check_manual(args.pdf, args.matrices)
+        for problem in problems:
+            print(problem)
+        print(f"round trip: {len(problems)} problem(s) in {written} pages")
+        sys.exit(1 if problems else 0)
@@ -1,16 +1,21 @@
 import pdfplumber
-import pandas as pd
+import pypdfium2 as pdfium
 from pathlib import Path
 import re
 import json
+import sys
 
-import common_parts_new, common_parts_new_22
-import mainfold_fluid, mainfold_fluid_1, diaphrgm_3, seat_options
+# Section parsers (and pandas) are imported where they are used, so
+# quick runs only pay for the parsers their pages need
+import instrument
+import page_router
 
 # ==========================================================
 # CLEANING UTILITIES
 # ==========================================================
 def table_contains(df, keywords):
+    import pandas as pd
+
     table_text = " ".join(
         str(x) for row in df.values for x in row if pd.notna(x)
     ).upper()
@@ -18,19 +23,56 @@ def table_contains(df, keywords):
     return all(keyword.upper() in table_text for keyword in keywords)
 
 
-def parse_all_tables(dfs):
+def header_contains(df, keyword):
+    header_text = " ".join(str(c) for c in df.columns).upper()
+    return keyword.upper() in header_text
+
+
+def classify_table(df):
+    """
+    Section a table belongs to: "common_parts", "mainfold", "dipram",
+    "ball", "seat", or None when it matches none of them.
+    """
+    if "COMMON PARTS" in df:
+        return "common_parts"
+    if table_contains(df, ["MANIFOLD", "FLUID CAP"]):
+        return "mainfold"
+    if table_contains(df, ["DIAPHRAGM"]):
+        return "dipram"
+    if table_contains(df, ["BALL"]):
+        return "ball"
+    # A seat half split off a Seat + Ball grid keeps its title as header
+    if table_contains(df, ["SEAT", "SEAT OPTIONS"]) or (
+        table_contains(df, ["SEAT"]) and header_contains(df, "SEAT OPTIONS")
+    ):
+        return "seat"
+    return None
+
+
+def parse_all_tables(dfs, kinds=None):
 
     final_json = {}
-    df_mainfold = pd.DataFrame()
+    manifold_dfs = []
+
+    if kinds is None:
+        with instrument.span("tables.classify", tables=len(dfs)):
+            kinds = [classify_table(df) for df in dfs]
 
-    for df in dfs:
-        if "COMMON PARTS" in df:
+    classified = sum(1 for kind in kinds if kind)
+    instrument.count("tables.seen", len(dfs))
+    instrument.count("tables.classified", classified)
+    instrument.count("tables.skipped", len(dfs) - classified)
+
+    for df, kind in zip(dfs, kinds):
+        if kind == "common_parts":
             print("df..............................", df)
-            common_parts = common_parts_new.common_parts_to_json(df)
+            import common_parts_new
+            with instrument.span("parse.common_parts"):
+                common_parts = common_parts_new.common_parts_to_json(df)
             final_json["common_parts"]=common_parts
             print("common parts 4444", final_json )
-        elif table_contains(df, ["MANIFOLD", "FLUID CAP"]):
-            df_mainfold = pd.concat([df_mainfold, df], ignore_index=True)
+        elif kind == "mainfold":
+            manifold_dfs.append(df)
             
             # print("Added a MANIFOLD/FLUID CAP table. Current length:", len(df_mainfold))
             # df1+=df
@@ -40,15 +82,20 @@ def parse_all_tables(dfs):
             # final_json["mainfold"] = mainfold
             # print ("df1111111111111111222222222222", df_mainfold)
             
-        elif table_contains(df, ["DIAPHRAGM"]):
-            dipram =diaphrgm_3.extract_diaphragm_options(df)
+        elif kind == "dipram":
+            import diaphrgm_3
+            with instrument.span("parse.dipram"):
+                dipram =diaphrgm_3.extract_diaphragm_options(df)
             # print("DIAPHRAGM Options", df)
             # print("df33333", dipram)
             final_json["dipram"]=dipram
-        elif table_contains(df, ["BALL"]):
+        elif kind == "ball":
             print("BALL..", df)
-        elif table_contains(df, ["SEAT", "SEAT OPTIONS"]):
-            seat  = seat_options.df_to_json(df)
+        elif kind == "seat":
+            import seat_options
+            with instrument.span("parse.seat"):
+                seat = seat_options.parse_seat_table([list(df.columns)] + df.values.tolist())
+            final_json["seat"] = seat
             print("SEAT..", df)
         
 
@@ -56,9 +103,18 @@ def parse_all_tables(dfs):
         
 
     print("\n \n ")
-    # print ("df_mainfold", df_mainfold)
-    mainfold = mainfold_fluid_1.extract_manifold_json_from_dfs(df_mainfold)
-    final_json["mainfold"]=mainfold
+    if manifold_dfs:
+        import pandas as pd
+        import mainfold_fluid_1
+
+        df_mainfold = pd.concat(manifold_dfs, ignore_index=True)
+        # print ("df_mainfold", df_mainfold)
+        with instrument.span("parse.mainfold"):
+            mainfold = mainfold_fluid_1.extract_manifold_json_from_dfs(df_mainfold)
+        final_json["mainfold"]=mainfold
+
+    for section, value in final_json.items():
+        instrument.count(f"records.{section}", instrument.count_records(value))
     
     # print("Current Length", final_json)
     return final_json
@@ -146,74 +202,97 @@ def split_seat_ball_table(df):
 # EXTRACT TABLES + SMART MERGE
 # ==========================================================
 
-def extract_tables_as_dataframes(pdf_path, page_number):
-
-    pdf_path = Path(pdf_path)
-
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF not found: {pdf_path}")
+def tables_to_dataframes(tables):
+    """
+    DataFrames for a page's raw tables (first row as header), with
+    Seat + Ball tables split and same-length side-by-side tables merged.
+    """
+    import pandas as pd
 
     extracted_dfs = []
 
-    with pdfplumber.open(pdf_path) as pdf:
+    if not tables:
+        return extracted_dfs
 
-        if page_number < 1 or page_number > len(pdf.pages):
-            raise ValueError("Invalid page number")
+    raw_dfs = []
 
-        page = pdf.pages[page_number - 1]
-        tables = page.extract_tables()
+    # Convert raw tables to DataFrames
+    for table in tables:
+        cleaned = [[clean_cell(c) for c in row] for row in table]
+        df = pd.DataFrame(cleaned)
 
-        if not tables:
-            return extracted_dfs
+        if df.shape[0] > 1:
+            df.columns = df.iloc[0]
+            df = df.iloc[1:].reset_index(drop=True)
 
-        raw_dfs = []
+        raw_dfs.append(df)
+    # print("raw_df", raw_dfs)
 
-        # Convert raw tables to DataFrames
-        for table in tables:
-            cleaned = [[clean_cell(c) for c in row] for row in table]
-            df = pd.DataFrame(cleaned)
+    # --------------------------------------------------
+    # SMART MERGE LOGIC
+    # --------------------------------------------------
 
-            if df.shape[0] > 1:
-                df.columns = df.iloc[0]
-                df = df.iloc[1:].reset_index(drop=True)
+    i = 0
+    while i < len(raw_dfs):
 
-            raw_dfs.append(df)
-        # print("raw_df", raw_dfs)
+        current_df = raw_dfs[i]
 
-        # --------------------------------------------------
-        # SMART MERGE LOGIC
-        # --------------------------------------------------
+        # If Seat + Ball combined in same table → split
+        header_text = " ".join(str(c).lower() for c in current_df.columns)
 
-        i = 0
-        while i < len(raw_dfs):
+        if "seat" in header_text and any(k in header_text for k in BALL_KEYWORDS):
+            split_tables = split_seat_ball_table(current_df)
+            extracted_dfs.extend(split_tables)
+            i += 1
+            continue
 
-            current_df = raw_dfs[i]
+        # Merge side-by-side tables if same row count
+        if i + 1 < len(raw_dfs):
 
-            # If Seat + Ball combined in same table → split
-            header_text = " ".join(str(c).lower() for c in current_df.columns)
+            next_df = raw_dfs[i + 1]
 
-            if "seat" in header_text and any(k in header_text for k in BALL_KEYWORDS):
-                split_tables = split_seat_ball_table(current_df)
-                extracted_dfs.extend(split_tables)
-                i += 1
+            if len(current_df) == len(next_df):
+                merged_df = pd.concat([current_df, next_df], axis=1)
+                extracted_dfs.append(merged_df)
+                i += 2
                 continue
 
-            # Merge side-by-side tables if same row count
-            if i + 1 < len(raw_dfs):
+        extracted_dfs.append(current_df)
+        i += 1
 
-                next_df = raw_dfs[i + 1]
+    # print ("extracted_dfs.................", extracted_dfs)
+    return extracted_dfs
 
-                if len(current_df) == len(next_df):
-                    merged_df = pd.concat([current_df, next_df], axis=1)
-                    extracted_dfs.append(merged_df)
-                    i += 2
-                    continue
 
-            extracted_dfs.append(current_df)
-            i += 1
+def extract_tables_as_dataframes(pdf_path, page_number):
 
-    # print ("extracted_dfs.................", extracted_dfs)
-    return extracted_dfs
+    pdf_path = Path(pdf_path)
+
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"PDF not found: {pdf_path}")
+
+    with instrument.span("pdfplumber.open"):
+        pdf = pdfplumber.open(pdf_path)
+
+    with pdf:
+
+        if page_number < 1 or page_number > len(pdf.pages):
+            raise ValueError("Invalid page number")
+
+        page = pdf.pages[page_number - 1]
+
+        # Scanned / garbled pages get OCR-rebuilt tables of the same shape
+        pdfium_doc = pdfium.PdfDocument(str(pdf_path))
+        pdfium_page = pdfium_doc[page_number - 1]
+        try:
+            tables = page_router.extract_tables(page, pdfium_page)
+        finally:
+            pdfium_page.close()
+            pdfium_doc.close()
+            page.close()
+
+    with instrument.span("tables.dataframes", tables=len(tables)):
+        return tables_to_dataframes(tables)
 
 
 # ==========================================================
@@ -254,7 +333,10 @@ def process_page(pdf_path, page_number):
     all_tables = extract_tables_as_dataframes(pdf_path, page_number)
     json_output = parse_all_tables(all_tables)
 
-    print(json.dumps(json_output, indent=2))
+    with instrument.span("json.dumps"):
+        output = json.dumps(json_output, indent=2)
+
+    print(output)
     
 
 # ==========================================================
@@ -269,3 +351,6 @@ if __name__ == "__main__":
     data = process_page(PDF_FILE, PAGE_NUMBER)
 
     print(json.dumps(data, indent=2))
+
+    if instrument.ENABLED:
+        print(instrument.format_report(), file=sys.stderr)
@@ -37,7 +37,7 @@ def extract_option_entries(df, stop_words=None):
 
     for _, row in df.iterrows():
 
-        row_text = " ".join(row.astype(str)).upper()
+        row_text = " ".join(str(v) for v in row).upper()
 
         if stop_words:
             if any(word in row_text for word in stop_words):
@@ -0,0 +1,107 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import pytesseract
+
+import ocr_cache
+
+# ---------------------------------------------------
+# CONFIG
+# ---------------------------------------------------
+
+BATCH_SIZE = 16
+DEFAULT_LANG = "eng"
+
+# tesseract ends every page of a multi-image run with a form feed
+PAGE_SEPARATOR = "\f"
+
+# ---------------------------------------------------
+# Helpers
+# ---------------------------------------------------
+
+@lru_cache(maxsize=None)
+def tesseract_version():
+    return pytesseract.get_tesseract_version()
+
+
+def image_key(image_path, lang):
+    return ocr_cache.ocr_key(image_path, "tesseract", tesseract_version(), (lang,))
+
+
+def chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+# ---------------------------------------------------
+# One tesseract process per batch
+# ---------------------------------------------------
+
+def ocr_batch(image_paths, lang=DEFAULT_LANG):
+    """
+    Run tesseract once over a list file of images and split the output
+    back into one text per image.
+    """
+    image_paths = [str(Path(p).resolve()) for p in image_paths]
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write("\n".join(image_paths) + "\n")
+        list_file = f.name
+
+    try:
+        output = pytesseract.image_to_string(list_file, lang=lang)
+    finally:
+        os.remove(list_file)
+
+    texts = output.split(PAGE_SEPARATOR)
+    if texts and not texts[-1].strip():
+        texts.pop()
+
+    # A multi-frame image (TIFF) adds pages and shifts every later text
+    if len(texts) != len(image_paths):
+        raise RuntimeError(
+            f"tesseract returned {len(texts)} pages for {len(image_paths)} images"
+        )
+
+    return texts
+
+
+def _ocr_batch_job(job):
+    image_paths, lang = job
+    return ocr_batch(image_paths, lang)
+
+
+def ocr_images(image_paths, lang=DEFAULT_LANG, batch_size=BATCH_SIZE, workers=1):
+    """
+    Return {image_path: text} for many images. Cached images are
+    skipped, the rest are OCR'd batch_size images per tesseract
+    invocation, spread over `workers` processes.
+    """
+    image_paths = [str(p) for p in image_paths]
+    results = {}
+    misses = []
+
+    for path in image_paths:
+        cached = ocr_cache.get_cached(image_key(path, lang))
+        if cached is None:
+            misses.append(path)
+        else:
+            results[path] = cached
+
+    batches = list(chunks(misses, batch_size))
+    jobs = [(batch, lang) for batch in batches]
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(_ocr_batch_job, jobs))
+    else:
+        outputs = [_ocr_batch_job(job) for job in jobs]
+
+    for batch, texts in zip(batches, outputs):
+        for path, text in zip(batch, texts):
+            ocr_cache.put_cached(image_key(path, lang), text)
+            results[path] = text
+
+    return {path: results[path] for path in image_paths}